@@ -145,8 +145,8 @@ class MultiTimeframeValidator:
         t_validation_result = self.tzv_validator.validate_t_tendencia(
             highs, lows, closes, lookback=min(20, len(closes))
         )
-        # Extract boolean validation from result dict
-        t_validation = t_validation_result.get('validation_passed', False)
+        # Extract boolean validation from result
+        t_validation = t_validation_result.validation_passed
 
         # Validar Z (Zonas) - simplificado
         z_validation = len(highs) > 3 and (np.max(highs) > np.min(lows))
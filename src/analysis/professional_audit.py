@@ -294,7 +294,7 @@ class ProfessionalAudit:
         closes = np.array([90.2, 90.7, 91.1, 91.6, 92.0])
 
         t = validator.validate_t_tendencia(highs, lows, closes)
-        assert t['validation_passed'], "Strong uptrend should pass T"
+        assert t.validation_passed, "Strong uptrend should pass T"
         print("    ✅ T validation for uptrend: PASS")
 
         # Test: Z validation with sufficient levels
@@ -310,13 +310,13 @@ class ProfessionalAudit:
         }
 
         z = validator.validate_z_zonas(supports, resistances, 91.0)
-        assert z['validation_passed'], "Clear zones should pass Z"
+        assert z.validation_passed, "Clear zones should pass Z"
         print("    ✅ Z validation for clear zones: PASS")
 
         # Test: V validation with good risk/reward
         v = validator.validate_v_vacio(91.0, 95.0, 89.0)
-        assert v['validation_passed'], "2:1 ratio should pass V"
-        assert v['ratio'] == 2.0, "Ratio should be exactly 2.0"
+        assert v.validation_passed, "2:1 ratio should pass V"
+        assert v.ratio == 2.0, "Ratio should be exactly 2.0"
         print("    ✅ V validation for good ratio: PASS")
 
         return {'status': 'PASS', 'validations': 3}
@@ -355,16 +355,16 @@ class ProfessionalAudit:
         # Risk: 91-89=2, Reward: 95-91=4, Ratio: 4/2=2.0
         result = validator.validate_v_vacio(91.0, 95.0, 89.0)
 
-        assert result['vacio_up'] == 4.0, "Reward calculation wrong"
-        assert result['vacio_down'] == 2.0, "Risk calculation wrong"
-        assert result['ratio'] == 2.0, "Ratio calculation wrong"
-        assert result['validation_passed'], "2.0 ratio should pass"
+        assert result.vacio_up == 4.0, "Reward calculation wrong"
+        assert result.vacio_down == 2.0, "Risk calculation wrong"
+        assert result.ratio == 2.0, "Ratio calculation wrong"
+        assert result.validation_passed, "2.0 ratio should pass"
         print("    ✅ Risk/reward calculation: PASS")
 
         # Test case: Bad ratio (1.5:1)
         bad = validator.validate_v_vacio(91.0, 93.0, 89.0)
-        assert bad['ratio'] == 1.0, "Bad ratio calculation"
-        assert not bad['validation_passed'], "1.0 ratio should fail"
+        assert bad.ratio == 1.0, "Bad ratio calculation"
+        assert not bad.validation_passed, "1.0 ratio should fail"
         print("    ✅ Bad ratio rejection: PASS")
 
         return {'status': 'PASS', 'risk_tests': 2}
@@ -522,7 +522,7 @@ class ProfessionalAudit:
 
         # Step 2: Validate T+Z+V
         t = validator.validate_t_tendencia(highs, lows, closes)
-        assert t['validation_passed']
+        assert t.validation_passed
         print("    ✅ TZVValidator → Trend Strength")
 
         # Step 3: Detect Scenario
@@ -42,6 +42,45 @@ class StructurePhase(Enum):
     NEUTRAL = "neutral"                      # No clear structure
 
 
+# Integer codes for StructurePhase, used by the vectorized (batch) paths
+PHASE_BY_CODE = tuple(StructurePhase)
+PHASE_CODE = {phase: code for code, phase in enumerate(PHASE_BY_CODE)}
+
+
+def _pivot_trend_batch(windows: np.ndarray, peaks: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Máximos/mínimos trend for every row of a (n_windows, window) view
+
+    Same pivot rule as analyze_maximos_minimos(): first and last candle are
+    always pivots, interior candles are pivots when >= (peaks) or <= (valleys)
+    both neighbours. The trend is 'crecientes' when every pivot is strictly
+    above the previous one, 'decrecientes' when strictly below, else 'flat'.
+
+    Returns:
+        (trend, confirmed): trend is +1 crecientes / -1 decrecientes / 0 flat,
+        confirmed is the pivot count (0 when flat)
+    """
+    prev, cur, nxt = windows[:, :-2], windows[:, 1:-1], windows[:, 2:]
+    mask = np.ones(windows.shape, dtype=bool)
+    if peaks:
+        mask[:, 1:-1] = (cur >= prev) & (cur >= nxt)
+    else:
+        mask[:, 1:-1] = (cur <= prev) & (cur <= nxt)
+
+    # Index of the previous pivot for every position (forward fill of pivot indices)
+    pivot_idx = np.where(mask, np.arange(windows.shape[1]), 0)
+    last_pivot = np.maximum.accumulate(pivot_idx, axis=1)[:, :-1]
+    prev_pivot_values = np.take_along_axis(windows, last_pivot, axis=1)
+
+    is_pivot = mask[:, 1:]
+    increasing = np.all(~is_pivot | (windows[:, 1:] > prev_pivot_values), axis=1)
+    decreasing = np.all(~is_pivot | (windows[:, 1:] < prev_pivot_values), axis=1)
+
+    trend = increasing.astype(np.int8) - decreasing.astype(np.int8)
+    confirmed = np.where(trend != 0, np.count_nonzero(mask, axis=1), 0)
+    return trend, confirmed
+
+
 class StructureChangeDetector:
     """
     Detects trend changes through price structure analysis
@@ -206,6 +245,7 @@ class StructureChangeDetector:
                 'phase': StructurePhase enum,
                 'description': str,
                 'confidence': float (0-1),
+                'strength_bucket': int (0-4, confidence in fifths: 2 = 0.4+, 3 = 0.6+, 4 = 0.8+),
                 'maximos_minimos': {structure analysis}
             }
         """
@@ -250,9 +290,85 @@ class StructureChangeDetector:
             'phase': phase,
             'description': description,
             'confidence': confidence,
+            'strength_bucket': min(int(confidence * 5), 4),
             'maximos_minimos': structure
         }
 
+    def detect_structure_phase_batch(self,
+                                     highs: np.ndarray,
+                                     lows: np.ndarray,
+                                     window: Optional[int] = None) -> Dict:
+        """
+        Vectorized detect_structure_phase over every rolling window of the series
+
+        Each row is the result detect_structure_phase() would give for the
+        last `window` candles ending at that bar (capped by self.lookback and
+        len(highs)), computed with 2D window views instead of one Python call
+        per bar.
+
+        Args:
+            highs: Array of candle highs
+            lows: Array of candle lows
+            window: Candles per window (default: self.lookback)
+
+        Returns:
+            {
+                'window': int (candles per window),
+                'phase_code': np.ndarray[int8] (index into PHASE_BY_CODE),
+                'confidence': np.ndarray[float64] (0-1),
+                'strength_bucket': np.ndarray[int8] (0-4, see detect_structure_phase)
+            }
+            Row k corresponds to the window ending at bar k + window - 1.
+        """
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        window = min(len(highs), self.lookback, window if window is not None else self.lookback)
+
+        if window < 3:
+            n_windows = len(highs) - window + 1 if window > 0 else 0
+            return {
+                'window': window,
+                'phase_code': np.full(n_windows, PHASE_CODE[StructurePhase.NEUTRAL], dtype=np.int8),
+                'confidence': np.full(n_windows, 0.3),
+                'strength_bucket': np.full(n_windows, 1, dtype=np.int8)
+            }
+
+        max_trend, max_confirmed = _pivot_trend_batch(
+            np.lib.stride_tricks.sliding_window_view(highs, window), peaks=True
+        )
+        min_trend, min_confirmed = _pivot_trend_batch(
+            np.lib.stride_tricks.sliding_window_view(lows, window), peaks=False
+        )
+
+        bullish_strong = (max_trend == 1) & (min_trend == 1)
+        bearish_strong = (max_trend == -1) & (min_trend == -1)
+        bullish_weak = (max_trend == 1) & (min_trend == 0)
+        bearish_weak = (max_trend == -1) & (min_trend == 0)
+        transitional = max_trend * min_trend == -1
+
+        conditions = [bullish_strong, bearish_strong, bullish_weak, bearish_weak, transitional]
+        strong_confidence = np.minimum(1.0, (max_confirmed + min_confirmed) / 8)
+
+        phase_code = np.select(
+            conditions,
+            [PHASE_CODE[StructurePhase.BULLISH_STRONG], PHASE_CODE[StructurePhase.BEARISH_STRONG],
+             PHASE_CODE[StructurePhase.BULLISH_WEAK], PHASE_CODE[StructurePhase.BEARISH_WEAK],
+             PHASE_CODE[StructurePhase.TRANSITIONAL]],
+            default=PHASE_CODE[StructurePhase.NEUTRAL]
+        ).astype(np.int8)
+        confidence = np.select(
+            conditions,
+            [strong_confidence, strong_confidence, 0.6, 0.6, 0.4],
+            default=0.3
+        )
+
+        return {
+            'window': window,
+            'phase_code': phase_code,
+            'confidence': confidence,
+            'strength_bucket': np.minimum((confidence * 5).astype(np.int8), 4)
+        }
+
     def detect_structure_reversal(self,
                                  highs: np.ndarray,
                                  lows: np.ndarray,
@@ -282,6 +398,32 @@ class StructureChangeDetector:
             }
         """
         current = self.detect_structure_phase(highs, lows)
+        return self._reversal_from_phase(current)
+
+    def detect_phase_and_reversal(self,
+                                  highs: np.ndarray,
+                                  lows: np.ndarray,
+                                  start: int = 0,
+                                  end: Optional[int] = None) -> Tuple[Dict, Dict]:
+        """
+        detect_structure_phase + detect_structure_reversal in a single pass
+
+        The reversal check reuses the phase computed for highs[start:end]
+        instead of analyzing the same máximos/mínimos a second time.
+
+        Args:
+            highs: Array of candle highs
+            lows: Array of candle lows
+            start, end: Window of the arrays to analyze (views, no copy)
+
+        Returns:
+            (phase_info, reversal_info) - same dicts as the two separate methods
+        """
+        current = self.detect_structure_phase(highs[start:end], lows[start:end])
+        return current, self._reversal_from_phase(current)
+
+    def _reversal_from_phase(self, current: Dict) -> Dict:
+        """Update reversal tracking from an already computed phase (see detect_structure_reversal)"""
         current_phase_str = current['phase'].value
 
         # If we don't have history, we can't detect change
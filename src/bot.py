@@ -63,7 +63,7 @@ from src.risk_management.risk_manager import RiskManager
 from src.strategy.dynamic_mode_manager import DynamicModeManager
 from src.analysis.market_analyzer import MarketAnalyzer
 from src.analysis.referentes_calculator import ReferentesCalculator
-from src.strategy.tzv_validator import TZVValidator
+from src.strategy.tzv_validator import TZVValidator, VValidation, VacioValidity
 from src.analysis.multitimeframe_validator import MultiTimeframeValidator
 # NEW v3.6+ - Multi-Timeframe Continuous Monitoring
 from src.analysis.multi_timeframe_data_loader import MultiTimeframeDataLoader
@@ -368,9 +368,9 @@ class TRADBot_v3:
             {
                 'all_passed': bool,
                 'can_trade': bool,
-                't_validation': dict,
-                'z_validation': dict,
-                'v_validation': dict,
+                't_validation': TValidation,
+                'z_validation': ZValidation,
+                'v_validation': VValidation,
                 'complete_validation': dict,
                 'referentes_map': dict
             }
@@ -399,8 +399,8 @@ class TRADBot_v3:
 
         # Step 4: Validate V (Vacío) - requires entry point
         # For now, use current price as potential entry
-        first_support = z_validation.get('first_support')
-        first_resistance = z_validation.get('first_resistance')
+        first_support = z_validation.first_support
+        first_resistance = z_validation.first_resistance
 
         if first_support and first_resistance:
             v_validation = self.tzv_validator.validate_v_vacio(
@@ -410,14 +410,14 @@ class TRADBot_v3:
                 min_ratio=2.0  # Crecetrader minimum 2:1
             )
         else:
-            v_validation = {
-                'validity': 'poor',
-                'vacio_up': 0,
-                'vacio_down': 0,
-                'ratio': 0,
-                'validation_passed': False,
-                'description': 'Cannot validate Vacío: missing support or resistance'
-            }
+            v_validation = VValidation(
+                validity=VacioValidity.POOR,
+                vacio_up=0,
+                vacio_down=0,
+                ratio=0,
+                validation_passed=False,
+                description='Cannot validate Vacío: missing support or resistance'
+            )
 
         # Step 5: Complete T+Z+V validation
         complete_validation = self.tzv_validator.validate_tzv_complete(
@@ -428,9 +428,9 @@ class TRADBot_v3:
 
         # Log validation results
         self._log_event('TZV_VALIDATION',
-            t_passed=t_validation.get('validation_passed'),
-            z_passed=z_validation.get('validation_passed'),
-            v_passed=v_validation.get('validation_passed'),
+            t_passed=t_validation.validation_passed,
+            z_passed=z_validation.validation_passed,
+            v_passed=v_validation.validation_passed,
             all_passed=complete_validation.get('all_passed'),
             confidence=complete_validation.get('confidence'),
             description=complete_validation.get('description')
@@ -441,10 +441,10 @@ class TRADBot_v3:
             self._log_event('TZV_PASSED',
                 confidence=complete_validation.get('confidence'),
                 description=complete_validation.get('description'),
-                t_details=t_validation.get('description', ''),
-                z_details=z_validation.get('description', ''),
-                v_details=v_validation.get('description', ''),
-                risk_reward_ratio=v_validation.get('rr_ratio', 0)
+                t_details=t_validation.description,
+                z_details=z_validation.description,
+                v_details=v_validation.description,
+                risk_reward_ratio=v_validation.ratio
             )
 
         return {
@@ -843,6 +843,7 @@ class TRADBot_v3:
         # Merge basic context + multi-timeframe context
         enhanced_context = {
             'volatility': volatility_desc,
+            'volatility_pct': market_context['volatility']['current_range_pct'],
             'momentum': momentum_desc
         }
         if multitf_context:
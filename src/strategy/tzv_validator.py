@@ -21,10 +21,11 @@ Trading Rules:
 5. If any NO → WAIT or SKIP this opportunity
 """
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import numpy as np
-from src.analysis.structure_change_detector import StructureChangeDetector
+from src.analysis.structure_change_detector import StructureChangeDetector, StructurePhase, PHASE_CODE
 
 
 class TendencyStrength(Enum):
@@ -55,6 +56,90 @@ class VacioValidity(Enum):
     POOR = "poor"            # < 1.5:1 (REJECT)
 
 
+# Integer codes for the enums, used by the batch path and the columnar validation history
+STRENGTH_BY_CODE = tuple(TendencyStrength)
+STRENGTH_CODE = {strength: code for code, strength in enumerate(STRENGTH_BY_CODE)}
+CLARITY_BY_CODE = tuple(ZoneClarity)
+CLARITY_CODE = {clarity: code for code, clarity in enumerate(CLARITY_BY_CODE)}
+VALIDITY_BY_CODE = tuple(VacioValidity)
+VALIDITY_CODE = {validity: code for code, validity in enumerate(VALIDITY_BY_CODE)}
+
+# TendencyStrength by structure strength_bucket (confidence in fifths: 2 = 0.4+, 3 = 0.6+, 4 = 0.8+).
+# Bucket 4 is CLEAR only when HH/HL counting confirms it, otherwise it drops to MODERATE.
+_STRENGTH_BY_BUCKET_UP = (
+    TendencyStrength.UNCLEAR, TendencyStrength.UNCLEAR, TendencyStrength.WEAK_UP,
+    TendencyStrength.MODERATE_UP, TendencyStrength.CLEAR_UP
+)
+_STRENGTH_BY_BUCKET_DOWN = (
+    TendencyStrength.UNCLEAR, TendencyStrength.UNCLEAR, TendencyStrength.WEAK_DOWN,
+    TendencyStrength.MODERATE_DOWN, TendencyStrength.CLEAR_DOWN
+)
+_STRENGTH_CODES_BY_BUCKET_UP = np.array([STRENGTH_CODE[s] for s in _STRENGTH_BY_BUCKET_UP], dtype=np.int8)
+_STRENGTH_CODES_BY_BUCKET_DOWN = np.array([STRENGTH_CODE[s] for s in _STRENGTH_BY_BUCKET_DOWN], dtype=np.int8)
+
+
+def _count_trend(highs: np.ndarray, lows: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Count candle-to-candle HH/LH and HL/LL over the given window
+
+    A candle counts as HH (HL) when its high (low) is strictly above the
+    previous one, otherwise LH (LL). Runs on NumPy's compiled loops.
+
+    Returns:
+        (hh_count, lh_count, hl_count, ll_count)
+    """
+    if len(highs) < 2:
+        return 0, 0, 0, 0
+    hh_count = int(np.count_nonzero(np.diff(highs) > 0))
+    hl_count = int(np.count_nonzero(np.diff(lows) > 0))
+    return hh_count, len(highs) - 1 - hh_count, hl_count, len(lows) - 1 - hl_count
+
+
+@dataclass(slots=True)
+class TValidation:
+    """Result of validate_t_tendencia()"""
+    strength: TendencyStrength
+    is_uptrend: bool
+    is_downtrend: bool
+    hh_count: int                  # Higher highs
+    lh_count: int                  # Lower highs
+    hl_count: int                  # Higher lows
+    ll_count: int                  # Lower lows
+    hh_pct: float
+    hl_pct: float
+    validation_passed: bool        # Trend is CLEAR/MODERATE/WEAK
+    structure_phase: str           # PRIMARY signal
+    structure_confidence: float
+    reversal_detected: bool
+    reversal_info: Dict
+    description: str
+
+
+@dataclass(slots=True)
+class ZValidation:
+    """Result of validate_z_zonas()"""
+    clarity: ZoneClarity
+    supports_count: int
+    resistances_count: int
+    first_support: Optional[float]
+    first_resistance: Optional[float]
+    support_distance: Optional[float]     # Pips below price
+    resistance_distance: Optional[float]  # Pips above price
+    validation_passed: bool               # Zones are CLEAR
+    description: str
+
+
+@dataclass(slots=True)
+class VValidation:
+    """Result of validate_v_vacio()"""
+    validity: VacioValidity
+    vacio_up: float                # Pips to resistance
+    vacio_down: float              # Pips to SL
+    ratio: float                   # Reward / risk
+    validation_passed: bool        # ratio >= min_ratio
+    description: str
+
+
 class TZVValidator:
     """
     Validates the T+Z+V formula before allowing trades
@@ -68,15 +153,45 @@ class TZVValidator:
     def __init__(self):
         """Initialize validator"""
         self.last_validation = None
-        self.validation_history = []
-        self.structure_detector = StructureChangeDetector(lookback=20)
+        self._structure_detector = None  # Created on first T validation (see structure_detector)
         self.max_history_size = 1000  # CRITICAL FIX v3.5.1: Prevent memory leak from unbounded history
 
+        # Validation history as fixed-size columns (ring buffer, enums stored as int8 codes)
+        self._hist = {
+            't_passed': np.zeros(self.max_history_size, dtype=bool),
+            'z_passed': np.zeros(self.max_history_size, dtype=bool),
+            'v_passed': np.zeros(self.max_history_size, dtype=bool),
+            'all_passed': np.zeros(self.max_history_size, dtype=bool),
+            'confidence': np.zeros(self.max_history_size, dtype=np.float32),
+            'ratio': np.zeros(self.max_history_size, dtype=np.float32),
+            'strength': np.zeros(self.max_history_size, dtype=np.int8),
+            'clarity': np.zeros(self.max_history_size, dtype=np.int8),
+            'validity': np.zeros(self.max_history_size, dtype=np.int8),
+        }
+        self._hist_idx = 0  # Total validations recorded (next slot = _hist_idx % max_history_size)
+
+        # T validation memo for repeated calls on the same bar (see validate_t_tendencia)
+        self._t_cache: Dict[tuple, TValidation] = {}
+        self._t_cache_bar = None  # (length, last high, last low) the memo belongs to
+
+    @property
+    def structure_detector(self) -> StructureChangeDetector:
+        """
+        Structure detector, created lazily on first use
+
+        Kept per validator (not shared): the detector remembers the last
+        structure phase to detect reversals, so sharing it across symbols
+        would mix their histories.
+        """
+        if self._structure_detector is None:
+            self._structure_detector = StructureChangeDetector(lookback=20)
+        return self._structure_detector
+
     def validate_t_tendencia(self,
                             highs: np.ndarray,
                             lows: np.ndarray,
                             closes: np.ndarray,
-                            lookback: int = 20) -> Dict:
+                            lookback: int = 20) -> TValidation:
         """
         Validate T (Tendencia) - Trend identification
 
@@ -100,60 +215,59 @@ class TZVValidator:
             lookback: How many candles to analyze
 
         Returns:
-            {
-                'strength': TendencyStrength enum,
-                'is_uptrend': bool,
-                'is_downtrend': bool,
-                'hh_count': int (higher highs),
-                'lh_count': int (lower highs),
-                'hl_count': int (higher lows),
-                'll_count': int (lower lows),
-                'hh_pct': float,
-                'hl_pct': float,
-                'validation_passed': bool (trend is CLEAR),
-                'structure_phase': str (PRIMARY signal),
-                'reversal_detected': bool,
-                'description': str
-            }
+            TValidation (strength, HH/LH/HL/LL counts and percentages,
+            structure phase, reversal info, validation_passed, description)
+
+        Several strategy layers may validate the same bar: results are
+        memoized on the content of the analyzed window for the current bar,
+        and the memo is dropped as soon as the series length or last
+        high/low changes (new or updated bar), so repeated calls on one bar
+        also see the same reversal_detected.
         """
+        cache_key = None
+        if isinstance(highs, np.ndarray) and isinstance(lows, np.ndarray) and len(highs) > 0:
+            bar = (len(highs), highs[-1], lows[-1])
+            if bar != self._t_cache_bar:
+                self._t_cache.clear()
+                self._t_cache_bar = bar
+            # Keyed on the content of the analyzed window (the only input the
+            # result depends on), never on buffer addresses that NumPy may reuse
+            n = min(lookback, len(highs))
+            cache_key = (n, highs[-n:].tobytes(), lows[-n:].tobytes())
+            cached = self._t_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._compute_t_tendencia(highs, lows, lookback)
+        if cache_key is not None:
+            self._t_cache[cache_key] = result
+        return result
+
+    def _compute_t_tendencia(self, highs: np.ndarray, lows: np.ndarray, lookback: int) -> TValidation:
+        """Uncached body of validate_t_tendencia()"""
         if len(highs) < lookback:
             lookback = len(highs)
 
         recent_highs = highs[-lookback:]
         recent_lows = lows[-lookback:]
-        recent_closes = closes[-lookback:]
+        start = len(highs) - len(recent_highs)
 
         # ========================================
         # PRIMARY METHOD: Structure Change Detection
         # ========================================
-        structure_info = self.structure_detector.detect_structure_phase(recent_highs, recent_lows)
+        # Phase and reversal from one pass over the structure window
+        structure_info, reversal_info = self.structure_detector.detect_phase_and_reversal(
+            highs, lows, start=start
+        )
         structure_phase = structure_info['phase'].value
         structure_confidence = structure_info['confidence']
-
-        # Check for reversal
-        reversal_info = self.structure_detector.detect_structure_reversal(recent_highs, recent_lows)
         reversal_detected = reversal_info['reversal_detected']
 
         # ========================================
         # SECONDARY METHOD: Traditional HH/HL counting
         # ========================================
-        # Count HH (higher highs) and LH (lower highs)
-        hh_count = 0
-        lh_count = 0
-        for i in range(1, len(recent_highs)):
-            if recent_highs[i] > recent_highs[i-1]:
-                hh_count += 1
-            else:
-                lh_count += 1
-
-        # Count HL (higher lows) and LL (lower lows)
-        hl_count = 0
-        ll_count = 0
-        for i in range(1, len(recent_lows)):
-            if recent_lows[i] > recent_lows[i-1]:
-                hl_count += 1
-            else:
-                ll_count += 1
+        # Count HH/LH (higher/lower highs) and HL/LL (higher/lower lows)
+        hh_count, lh_count, hl_count, ll_count = _count_trend(recent_highs, recent_lows)
 
         # Calculate percentages
         total_highs = hh_count + lh_count
@@ -170,41 +284,22 @@ class TZVValidator:
         is_uptrend = 'bullish' in structure_phase
         is_downtrend = 'bearish' in structure_phase
 
-        # SECONDARY: Validate with HH/HL percentages
-        hh_confirms_up = hh_pct > 60 and hl_pct > 60
+        # SECONDARY: Validate with HH/HL percentages (hh_pct > 60 and hl_pct > 60,
+        # compared on integer counts to avoid float division on the gate)
+        hh_confirms_up = hh_count * 100 > 60 * total_highs and hl_count * 100 > 60 * total_lows
         hh_confirms_down = lh_count > hh_count * 2 and ll_count > hl_count * 2
 
         # Classify trend based on structure PRIMARY, with HH/HL as confirmation
+        bucket = structure_info['strength_bucket']
         if is_uptrend:
-            if structure_confidence >= 0.8 and hh_confirms_up:
-                strength = TendencyStrength.CLEAR_UP
-            elif structure_confidence >= 0.6:
-                strength = TendencyStrength.MODERATE_UP
-            elif structure_confidence >= 0.4:
-                strength = TendencyStrength.WEAK_UP
-            else:
-                strength = TendencyStrength.UNCLEAR
+            strength = _STRENGTH_BY_BUCKET_UP[bucket if bucket < 4 or hh_confirms_up else 3]
         elif is_downtrend:
-            if structure_confidence >= 0.8 and hh_confirms_down:
-                strength = TendencyStrength.CLEAR_DOWN
-            elif structure_confidence >= 0.6:
-                strength = TendencyStrength.MODERATE_DOWN
-            elif structure_confidence >= 0.4:
-                strength = TendencyStrength.WEAK_DOWN
-            else:
-                strength = TendencyStrength.UNCLEAR
+            strength = _STRENGTH_BY_BUCKET_DOWN[bucket if bucket < 4 or hh_confirms_down else 3]
         else:
             strength = TendencyStrength.UNCLEAR
 
-        # Validation: CLEAR, MODERATE, or WEAK are acceptable if confidence >= 0.4
-        validation_passed = strength in [
-            TendencyStrength.CLEAR_UP,
-            TendencyStrength.MODERATE_UP,
-            TendencyStrength.WEAK_UP,
-            TendencyStrength.CLEAR_DOWN,
-            TendencyStrength.MODERATE_DOWN,
-            TendencyStrength.WEAK_DOWN
-        ] and structure_confidence >= 0.4
+        # Validation: CLEAR, MODERATE, or WEAK are acceptable (confidence >= 0.4)
+        validation_passed = strength is not TendencyStrength.UNCLEAR
 
         # Build comprehensive description
         description = (
@@ -216,8 +311,112 @@ class TZVValidator:
         if reversal_detected:
             description += f" | ⚡ REVERSIÓN: {reversal_info['reversal_type']}"
 
+        return TValidation(
+            strength=strength,
+            is_uptrend=is_uptrend,
+            is_downtrend=is_downtrend,
+            hh_count=hh_count,
+            lh_count=lh_count,
+            hl_count=hl_count,
+            ll_count=ll_count,
+            hh_pct=hh_pct,
+            hl_pct=hl_pct,
+            validation_passed=validation_passed,
+            structure_phase=structure_phase,
+            structure_confidence=structure_confidence,
+            reversal_detected=reversal_detected,
+            reversal_info=reversal_info,
+            description=description
+        )
+
+    def validate_t_tendencia_batch(self,
+                                   highs: np.ndarray,
+                                   lows: np.ndarray,
+                                   closes: np.ndarray,
+                                   lookback: int = 20) -> Dict:
+        """
+        Vectorized validate_t_tendencia over every bar of a series
+
+        For backtests and multi-symbol scans: instead of one Python call per
+        bar, all rolling windows are evaluated at once with window views.
+        Row k is what validate_t_tendencia(highs[:k + lookback], ...) returns
+        on a fresh validator, except 'reversal_detected', which compares each
+        window with the previous row (first row is always False).
+
+        Args:
+            highs, lows, closes: Full OHLC arrays
+            lookback: How many candles each window analyzes
+
+        Returns:
+            Dict of arrays, one entry per window (row k ends at bar k + lookback - 1):
+            {
+                'bar_index': int64,
+                'strength_code': int8 (index into STRENGTH_BY_CODE),
+                'is_uptrend', 'is_downtrend': bool,
+                'hh_count', 'lh_count', 'hl_count', 'll_count': int64,
+                'hh_pct', 'hl_pct': float64,
+                'validation_passed': bool,
+                'structure_phase_code': int8 (index into PHASE_BY_CODE),
+                'structure_confidence': float64,
+                'reversal_detected': bool
+            }
+        """
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        if len(highs) < lookback:
+            lookback = len(highs)
+        n_windows = len(highs) - lookback + 1 if lookback > 0 else 0
+
+        # PRIMARY: structure per window (detector looks at its own, possibly shorter, window)
+        structure = self.structure_detector.detect_structure_phase_batch(highs, lows, lookback)
+        offset = lookback - structure['window']
+        phase_code = structure['phase_code'][offset:offset + n_windows]
+        structure_confidence = structure['confidence'][offset:offset + n_windows]
+
+        # SECONDARY: HH/HL counts per window from one diff + rolling count
+        if lookback > 1:
+            hh_count = np.count_nonzero(
+                np.lib.stride_tricks.sliding_window_view(np.diff(highs) > 0, lookback - 1), axis=-1
+            )
+            hl_count = np.count_nonzero(
+                np.lib.stride_tricks.sliding_window_view(np.diff(lows) > 0, lookback - 1), axis=-1
+            )
+        else:
+            hh_count = np.zeros(n_windows, dtype=np.int64)
+            hl_count = np.zeros(n_windows, dtype=np.int64)
+        total = max(lookback - 1, 0)
+        lh_count = total - hh_count
+        ll_count = total - hl_count
+
+        hh_pct = hh_count / total * 100 if total > 0 else np.zeros(n_windows)
+        hl_pct = hl_count / total * 100 if total > 0 else np.zeros(n_windows)
+
+        is_uptrend = np.isin(phase_code, [PHASE_CODE[StructurePhase.BULLISH_STRONG],
+                                          PHASE_CODE[StructurePhase.BULLISH_WEAK]])
+        is_downtrend = np.isin(phase_code, [PHASE_CODE[StructurePhase.BEARISH_STRONG],
+                                            PHASE_CODE[StructurePhase.BEARISH_WEAK]])
+
+        hh_confirms_up = (hh_count * 100 > 60 * total) & (hl_count * 100 > 60 * total)
+        hh_confirms_down = (lh_count > hh_count * 2) & (ll_count > hl_count * 2)
+
+        bucket = structure['strength_bucket'][offset:offset + n_windows]
+        bucket_up = np.where((bucket == 4) & ~hh_confirms_up, 3, bucket)
+        bucket_down = np.where((bucket == 4) & ~hh_confirms_down, 3, bucket)
+        strength_code = np.where(
+            is_uptrend, _STRENGTH_CODES_BY_BUCKET_UP[bucket_up],
+            np.where(is_downtrend, _STRENGTH_CODES_BY_BUCKET_DOWN[bucket_down],
+                     STRENGTH_CODE[TendencyStrength.UNCLEAR])
+        ).astype(np.int8)
+
+        validation_passed = strength_code != STRENGTH_CODE[TendencyStrength.UNCLEAR]
+
+        # Reversal: bearish -> bullish or bullish -> bearish between consecutive windows
+        reversal_detected = np.zeros(n_windows, dtype=bool)
+        reversal_detected[1:] = (is_uptrend[1:] & is_downtrend[:-1]) | (is_downtrend[1:] & is_uptrend[:-1])
+
         return {
-            'strength': strength,
+            'bar_index': np.arange(lookback - 1, lookback - 1 + n_windows),
+            'strength_code': strength_code,
             'is_uptrend': is_uptrend,
             'is_downtrend': is_downtrend,
             'hh_count': hh_count,
@@ -227,17 +426,15 @@ class TZVValidator:
             'hh_pct': hh_pct,
             'hl_pct': hl_pct,
             'validation_passed': validation_passed,
-            'structure_phase': structure_phase,
+            'structure_phase_code': phase_code,
             'structure_confidence': structure_confidence,
-            'reversal_detected': reversal_detected,
-            'reversal_info': reversal_info,
-            'description': description
+            'reversal_detected': reversal_detected
         }
 
     def validate_z_zonas(self,
                         supports: Dict,
                         resistances: Dict,
-                        current_price: float) -> Dict:
+                        current_price: float) -> ZValidation:
         """
         Validate Z (Zonas) - Support/Resistance clarity
 
@@ -252,17 +449,8 @@ class TZVValidator:
             current_price: Current market price
 
         Returns:
-            {
-                'clarity': ZoneClarity enum,
-                'supports_count': int,
-                'resistances_count': int,
-                'first_support': float,
-                'first_resistance': float,
-                'support_distance': float (pips from price),
-                'resistance_distance': float (pips from price),
-                'validation_passed': bool (zones are CLEAR),
-                'description': str
-            }
+            ZValidation (clarity, level counts, first support/resistance and
+            their distances, validation_passed, description)
         """
         # Count levels above and below current price
         supports_list = supports.get('supports', [])
@@ -309,23 +497,23 @@ class TZVValidator:
             f"Clarity: {clarity.value}"
         )
 
-        return {
-            'clarity': clarity,
-            'supports_count': len(supports_list),
-            'resistances_count': len(resistances_list),
-            'first_support': first_support,
-            'first_resistance': first_resistance,
-            'support_distance': support_distance,
-            'resistance_distance': resistance_distance,
-            'validation_passed': validation_passed,
-            'description': description
-        }
+        return ZValidation(
+            clarity=clarity,
+            supports_count=len(supports_list),
+            resistances_count=len(resistances_list),
+            first_support=first_support,
+            first_resistance=first_resistance,
+            support_distance=support_distance,
+            resistance_distance=resistance_distance,
+            validation_passed=validation_passed,
+            description=description
+        )
 
     def validate_v_vacio(self,
                         entry_price: float,
                         first_resistance: float,
                         first_support: float,
-                        min_ratio: float = 2.0) -> Dict:
+                        min_ratio: float = 2.0) -> VValidation:
         """
         Validate V (Vacío) - Available gap for risk/reward
 
@@ -341,25 +529,19 @@ class TZVValidator:
             min_ratio: Minimum ratio required (default 2.0)
 
         Returns:
-            {
-                'validity': VacioValidity enum,
-                'vacio_up': float (pips to resistance),
-                'vacio_down': float (pips to SL),
-                'ratio': float (reward / risk),
-                'validation_passed': bool (ratio >= min_ratio),
-                'description': str
-            }
+            VValidation (validity, vacio_up, vacio_down, ratio,
+            validation_passed, description)
         """
         # CRITICAL FIX: Validate entry price is within support-resistance range
         if not (first_support < entry_price < first_resistance):
-            return {
-                'validity': VacioValidity.POOR,
-                'vacio_up': 0,
-                'vacio_down': 0,
-                'ratio': 0,
-                'validation_passed': False,
-                'description': 'Entry price outside support-resistance range'
-            }
+            return VValidation(
+                validity=VacioValidity.POOR,
+                vacio_up=0,
+                vacio_down=0,
+                ratio=0,
+                validation_passed=False,
+                description='Entry price outside support-resistance range'
+            )
 
         vacio_up = first_resistance - entry_price
         vacio_down = entry_price - first_support
@@ -388,19 +570,19 @@ class TZVValidator:
             f"Ratio: {ratio:.2f}:1 | Validity: {validity.value}"
         )
 
-        return {
-            'validity': validity,
-            'vacio_up': vacio_up,
-            'vacio_down': vacio_down,
-            'ratio': ratio,
-            'validation_passed': validation_passed,
-            'description': description
-        }
+        return VValidation(
+            validity=validity,
+            vacio_up=vacio_up,
+            vacio_down=vacio_down,
+            ratio=ratio,
+            validation_passed=validation_passed,
+            description=description
+        )
 
     def validate_tzv_complete(self,
-                             t_validation: Dict,
-                             z_validation: Dict,
-                             v_validation: Dict) -> Dict:
+                             t_validation: TValidation,
+                             z_validation: ZValidation,
+                             v_validation: VValidation) -> Dict:
         """
         Validate COMPLETE T+Z+V formula
 
@@ -424,9 +606,9 @@ class TZVValidator:
                 'can_trade': bool (True if all 3 pass)
             }
         """
-        t_passed = t_validation.get('validation_passed', False)
-        z_passed = z_validation.get('validation_passed', False)
-        v_passed = v_validation.get('validation_passed', False)
+        t_passed = t_validation.validation_passed
+        z_passed = z_validation.validation_passed
+        v_passed = v_validation.validation_passed
 
         all_passed = t_passed and z_passed and v_passed
 
@@ -445,7 +627,7 @@ class TZVValidator:
         if z_passed:
             confidence += 0.35
         if v_passed:
-            v_ratio = v_validation.get('ratio', 0)
+            v_ratio = v_validation.ratio
             if v_ratio >= 3.0:
                 confidence += 0.35
             elif v_ratio >= 2.0:
@@ -454,29 +636,36 @@ class TZVValidator:
                 confidence += 0.15
 
         description = (
-            f"T:{t_validation['strength'].value if t_passed else '❌ FAIL'} | "
-            f"Z:{z_validation['clarity'].value if z_passed else '❌ FAIL'} | "
-            f"V:{v_validation['validity'].value if v_passed else '❌ FAIL'}"
+            f"T:{t_validation.strength.value if t_passed else '❌ FAIL'} | "
+            f"Z:{z_validation.clarity.value if z_passed else '❌ FAIL'} | "
+            f"V:{v_validation.validity.value if v_passed else '❌ FAIL'}"
         )
 
-        # Store validation history
+        # Store validation history - scalar summary only, so the full T/Z/V
+        # results (and the arrays they reference) can be garbage collected
         self.last_validation = {
-            't': t_validation,
-            'z': z_validation,
-            'v': v_validation,
-            'complete': {
-                't_passed': t_passed,
-                'z_passed': z_passed,
-                'v_passed': v_passed,
-                'all_passed': all_passed,
-                'confidence': confidence
-            }
+            't_passed': t_passed,
+            'z_passed': z_passed,
+            'v_passed': v_passed,
+            'all_passed': all_passed,
+            'confidence': confidence,
+            'ratio': v_validation.ratio,
+            'strength': t_validation.strength,
+            'clarity': z_validation.clarity,
+            'validity': v_validation.validity
         }
-        # CRITICAL FIX v3.5.1: Apply size limit to prevent memory leak
-        self.validation_history.append(self.last_validation)
-        if len(self.validation_history) > self.max_history_size:
-            # Remove oldest entry (FIFO circular buffer pattern)
-            self.validation_history.pop(0)
+        # CRITICAL FIX v3.5.1: Bounded history - ring buffer overwrites the oldest slot
+        slot = self._hist_idx % self.max_history_size
+        self._hist['t_passed'][slot] = t_passed
+        self._hist['z_passed'][slot] = z_passed
+        self._hist['v_passed'][slot] = v_passed
+        self._hist['all_passed'][slot] = all_passed
+        self._hist['confidence'][slot] = confidence
+        self._hist['ratio'][slot] = v_validation.ratio
+        self._hist['strength'][slot] = STRENGTH_CODE[t_validation.strength]
+        self._hist['clarity'][slot] = CLARITY_CODE[z_validation.clarity]
+        self._hist['validity'][slot] = VALIDITY_CODE[v_validation.validity]
+        self._hist_idx += 1
 
         return {
             't_passed': t_passed,
@@ -488,3 +677,17 @@ class TZVValidator:
             'description': description,
             'can_trade': all_passed  # Main decision
         }
+
+    def get_validation_history(self) -> Dict[str, np.ndarray]:
+        """
+        Recorded T+Z+V validations, oldest first (at most max_history_size)
+
+        Returns:
+            {column: np.ndarray} with t_passed, z_passed, v_passed, all_passed,
+            confidence, ratio and the int8 codes strength (STRENGTH_BY_CODE),
+            clarity (CLARITY_BY_CODE) and validity (VALIDITY_BY_CODE)
+        """
+        if self._hist_idx <= self.max_history_size:
+            return {name: column[:self._hist_idx].copy() for name, column in self._hist.items()}
+        oldest = self._hist_idx % self.max_history_size
+        return {name: np.roll(column, -oldest) for name, column in self._hist.items()}
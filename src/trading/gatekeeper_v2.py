@@ -10,16 +10,38 @@ Optimization focus:
 - Centralized decision logic
 """
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
 import json
+import math
 import os
+import re
+import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, List, Any
-import anthropic
+from typing import Optional, Dict, List, Any, Tuple
+import numpy as np
 from functools import lru_cache
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    # Fallback: stdlib json, compact bytes like orjson.dumps
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 # System prompt is cached to reduce token usage
 # NEW v3.6+ - Multi-Timeframe Aware System Prompt
-SYSTEM_PROMPT = """You are TRAD Bot's intelligent trading gatekeeper with MULTI-TIMEFRAME AWARENESS.
+# Split into shared preamble + per-level rules + shared tail: each request only
+# sends the rules of the active GATEKEEPER_LEVEL.
+_PREAMBLE = """You are TRAD Bot's intelligent trading gatekeeper with MULTI-TIMEFRAME AWARENESS.
 Your job is to decide whether to enter a trade using HIERARCHICAL TIMEFRAME ANALYSIS.
 
 ═══════════════════════════════════════════════════════════════════════════════
@@ -91,40 +113,40 @@ ADDITIONAL CONTEXT (when available):
 
 DECISION RULES by GATEKEEPER_LEVEL (Using Multi-Timeframe Context):
 
-LEVEL 1 (PERMISSIVE - Enter easily, trust strong alignment):
+"""
+
+_LEVEL_RULES = {
+    1: """LEVEL 1 (PERMISSIVE - Enter easily, trust strong alignment):
 - If alignment > 70%: Enter on RSI < 35 or > 65 in any phase
 - If alignment > 50%: Enter on RSI < 30 or > 70 in trending phases
 - Accept R:R >= 1:1 in strong aligned setups
-- Entry confidence: Based on alignment score
-
-LEVEL 2 (MODERATE):
+- Entry confidence: Based on alignment score""",
+    2: """LEVEL 2 (MODERATE):
 - ✅ If alignment > 70%: Trust MTF direction, enter on RSI 30-35 (oversold) or 65-70 (overbought)
 - ✅ If alignment 60-70%: Require 4H confirmation of Daily trend
 - ✅ Ignore single-timeframe "Phase" if MTF alignment > 70% (MTF takes priority)
 - R:R >= 1:1.5, favor aligned timeframes
-- Avoid if volatility > 2.5% and alignment < 70%
-
-LEVEL 3 (BALANCED - DEFAULT):
+- Avoid if volatility > 2.5% and alignment < 70%""",
+    3: """LEVEL 3 (BALANCED - DEFAULT):
 - Perfect alignment recommended: Daily = 4H = 1H
 - RSI < 30 or > 70 with alignment > 75%
 - R:R >= 1:2, strong confirmation required
-- Volatility check: If > 2%, need alignment > 80%
-
-LEVEL 4 (SELECTIVE):
+- Volatility check: If > 2%, need alignment > 80%""",
+    4: """LEVEL 4 (SELECTIVE):
 - Require strict alignment: Daily = 4H = 1H = 15m signals
 - RSI < 25 or > 75 (extreme oversold/bought)
 - R:R >= 1:3 minimum
 - Reject if volatility > 2% or alignment < 85%
-- Only trending/reversal phases, no consolidation
-
-LEVEL 5 (MAXIMUM SELECTIVE):
+- Only trending/reversal phases, no consolidation""",
+    5: """LEVEL 5 (MAXIMUM SELECTIVE):
 - Perfect alignment on ALL visible timeframes
 - RSI < 20 or > 80 (extreme extremes)
 - R:R >= 1:4 required
 - Only proven reversal setups with Daily reversal confirmation
-- Reject any volatility > 1.5% or if alignment < 90%
+- Reject any volatility > 1.5% or if alignment < 90%""",
+}
 
-═══════════════════════════════════════════════════════════════════════════════
+_TAIL = """═══════════════════════════════════════════════════════════════════════════════
 
 VOLATILITY CONTEXT HANDLING:
 
@@ -191,6 +213,69 @@ Examples:
 
 Respond ONLY with valid JSON. No explanations, no markdown."""
 
+# Full prompt with every level (reference / documentation)
+SYSTEM_PROMPT = _PREAMBLE + "\n\n".join(_LEVEL_RULES.values()) + "\n\n" + _TAIL
+
+# Level-specific system blocks, built once and sent by reference on every call.
+# One cache breakpoint over preamble + level rules + tail: the preamble alone
+# (~2.6 KB) is below the model's minimum cacheable prefix (1024 tokens), so a
+# separate breakpoint on it would never be written to the cache.
+_SYSTEM_BLOCK_L = {
+    level: [
+        {
+            "type": "text",
+            "text": _PREAMBLE + rules + "\n\n" + _TAIL,
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+    for level, rules in _LEVEL_RULES.items()
+}
+
+# Decision cache buckets: nearby snapshots share one cached decision
+_PRICE_BUCKET_LOG = math.log1p(0.001)  # Prices/EMAs bucketed to 0.1%
+# Shared HTTP transport: keep-alive pool sized for parallel scans, HTTP/2 when h2 is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_MAX_CONNECTIONS = 64  # Also caps in-flight requests in should_enter_batch()
+
+# Markdown code fence (```json ... ```) around a reply, opening and closing
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+_DIRECTIONS = {s: sys.intern(s) for s in ("BULLISH", "BEARISH", "NEUTRAL")}  # Interned cache key values
+_STATS_SAVE_EVERY = 50  # decisions between stats file writes (also saved at exit)
+
+
+def _json_object_end(text: str) -> int:
+    """
+    Index just past the first complete top-level JSON object in text, or -1
+
+    Braces inside string literals (e.g. in "reason") are ignored, so a
+    streamed reply is only cut once its outer object is closed.
+    """
+    depth = 0
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = depth > 0
+        elif ch == '{':
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _price_bucket(value: float) -> int:
+    """Bucket a price to 0.1% steps (log scale)"""
+    return round(math.log(value) / _PRICE_BUCKET_LOG) if value > 0 else 0
+
 
 class GatekeeperV2:
     """Claude-based trading decision engine with token optimization"""
@@ -206,17 +291,49 @@ class GatekeeperV2:
         self.level = max(1, min(5, level))  # Clamp 1-5
         self.mode = mode
 
+        # Lazy imports: anthropic pulls in httpx/pydantic (slow cold start),
+        # only paid when a gatekeeper is actually built
+        import anthropic
+        import httpx
+
+        limits = httpx.Limits(max_keepalive_connections=32, max_connections=_MAX_CONNECTIONS)
+        timeout = httpx.Timeout(10.0, connect=2.0)
         self.client = anthropic.Anthropic(
-            api_key=os.environ.get("ANTHROPIC_API_KEY")
+            api_key=os.environ.get("ANTHROPIC_API_KEY"),
+            http_client=httpx.Client(http2=_HTTP2, limits=limits, timeout=timeout)
+        )
+        self.aclient = anthropic.AsyncAnthropic(
+            api_key=os.environ.get("ANTHROPIC_API_KEY"),
+            http_client=httpx.AsyncClient(http2=_HTTP2, limits=limits, timeout=timeout)
         )
 
         self.log_file = f"logs/gatekeeper_{mode}.log"
         self.stats_file = f".gatekeeper_stats_{mode}.json"
-        self.decision_cache = {}  # Simple cache for repeated scenarios
+        self.batch_file = f".gatekeeper_batch_{mode}.json"  # In-flight offline batch (resume)
+        self.decision_cache = OrderedDict()  # LRU: key -> (decision, time.monotonic())
+        self._cache_max = 256
+        self._cache_ttl = 30  # seconds
+        # Persistent tier for cold starts (memory LRU -> disk -> Claude); key includes
+        # the level, entries are (decision, time.time()) held to the same TTL
+        try:
+            from diskcache import Cache
+            self.disk = Cache(f".gk_cache_{mode}")
+        except ImportError:
+            # diskcache optional: without it only the in-memory cache is used
+            self.disk = None
 
         self._ensure_logs_dir()
         self._load_stats()
 
+        # Log line timestamp, rebuilt at most once per wall-clock second
+        self._last_ts_sec = -1
+        self._last_ts_str = ''
+
+        # One buffered log handle for the process; stats flushed at exit
+        self._log_fh = open(self.log_file, 'a', buffering=8192)
+        atexit.register(self._log_fh.close)
+        atexit.register(self._save_stats)
+
     def _ensure_logs_dir(self):
         """Ensure logs directory exists"""
         os.makedirs("logs", exist_ok=True)
@@ -225,8 +342,8 @@ class GatekeeperV2:
         """Load decision statistics"""
         try:
             if os.path.exists(self.stats_file):
-                with open(self.stats_file, 'r') as f:
-                    self.stats = json.load(f)
+                with open(self.stats_file, 'rb') as f:
+                    self.stats = _json_loads(f.read())
             else:
                 self.stats = {
                     'total_decisions': 0,
@@ -239,11 +356,19 @@ class GatekeeperV2:
             # Stats file invalid or missing, use defaults
             self.stats = {'total_decisions': 0}
 
+        # Running confidence sum; average_confidence is derived on save/read
+        self._conf_sum = (
+            self.stats.get('average_confidence', 0.0) * self.stats.get('total_decisions', 0)
+        )
+
     def _save_stats(self):
         """Save decision statistics"""
+        self.stats['average_confidence'] = (
+            self._conf_sum / max(1, self.stats.get('total_decisions', 0))
+        )
         try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+            with open(self.stats_file, 'wb') as f:
+                f.write(_json_dumps(self.stats))
         except (IOError, OSError):
             # Failed to write stats file, skip silently
             pass
@@ -280,127 +405,475 @@ class GatekeeperV2:
             }
         """
 
-        # Build compact analysis message
-        analysis = self._build_analysis_message(
-            rsi, price, ema_fast, ema_slow, market_phase,
-            open_positions, reward_risk_ratio, additional_context
-        )
-
-        # Check simple cache first (for same exact conditions)
-        cache_key = hash(analysis)
-        if cache_key in self.decision_cache:
-            cached = self.decision_cache[cache_key]
-            if (datetime.now() - cached['timestamp']).total_seconds() < 30:
-                return cached['decision']
+        try:
+            # Obvious rejects decided by the hard rules, no API call
+            # (inside the try: bad inputs such as NaN RSI end in a safe reject)
+            fast = self._rules_prefilter(rsi, reward_risk_ratio, additional_context)
+            if fast is not None:
+                return fast
+
+            # Check simple cache first (for same bucketed conditions)
+            cache_key = self._cache_key(
+                rsi, price, ema_fast, ema_slow, market_phase,
+                open_positions, reward_risk_ratio, additional_context
+            )
+            cached = self._cached_decision(cache_key)
+            if cached is not None:
+                return cached
+
+            # Build compact analysis message
+            analysis = self._build_analysis_message(
+                rsi, price, ema_fast, ema_slow, market_phase,
+                open_positions, reward_risk_ratio, additional_context
+            )
 
+            # Call Claude with system prompt caching; stop reading once the JSON object closes
+            with self.client.messages.stream(**self._build_request(analysis)) as stream:
+                response_text = ''
+                end = -1
+                for text in stream.text_stream:
+                    response_text += text
+                    if '}' in text:
+                        end = _json_object_end(response_text)
+                        if end > 0:
+                            break
+                usage = stream.current_message_snapshot.usage
+            return self._decide(response_text[:end] if end > 0 else response_text,
+                                usage, analysis, cache_key)
+        except Exception as e:
+            return self._error_decision(e)
+
+    async def should_enter_async(self,
+                                 rsi: float,
+                                 price: float,
+                                 ema_fast: float,
+                                 ema_slow: float,
+                                 market_phase: str,
+                                 open_positions: int = 0,
+                                 reward_risk_ratio: float = 1.0,
+                                 additional_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Async should_enter() using AsyncAnthropic (same arguments and result)"""
         try:
-            # Call Claude with system prompt caching
-            response = self.client.messages.create(
-                model="claude-opus-4-1-20250805",
-                max_tokens=150,  # Only need JSON response
-                system=[
-                    {
-                        "type": "text",
-                        "text": SYSTEM_PROMPT,
-                        "cache_control": {"type": "ephemeral"}  # Cache system prompt
-                    }
-                ],
-                messages=[
-                    {
-                        "role": "user",
-                        "content": analysis
-                    }
-                ]
+            fast = self._rules_prefilter(rsi, reward_risk_ratio, additional_context)
+            if fast is not None:
+                return fast
+
+            cache_key = self._cache_key(
+                rsi, price, ema_fast, ema_slow, market_phase,
+                open_positions, reward_risk_ratio, additional_context
+            )
+            cached = self._cached_decision(cache_key)
+            if cached is not None:
+                return cached
+
+            analysis = self._build_analysis_message(
+                rsi, price, ema_fast, ema_slow, market_phase,
+                open_positions, reward_risk_ratio, additional_context
             )
 
-            # Parse Claude's JSON response
-            response_text = response.content[0].text.strip()
-
-            # Handle markdown code blocks if present
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-
-            decision_data = json.loads(response_text)
-
-            # Enhance decision with metadata
-            decision = {
-                'should_enter': decision_data.get('should_enter', False),
-                'confidence': decision_data.get('confidence', 0.0),
-                'reason': decision_data.get('reason', 'Unknown'),
-                'level': self.level,
-                'timestamp': datetime.now().isoformat(),
-                'tokens_used': {
-                    'input': response.usage.input_tokens,
-                    'output': response.usage.output_tokens,
-                    'cache_creation': response.usage.cache_creation_input_tokens,
-                    'cache_read': response.usage.cache_read_input_tokens
+            async with self.aclient.messages.stream(**self._build_request(analysis)) as stream:
+                response_text = ''
+                end = -1
+                async for text in stream.text_stream:
+                    response_text += text
+                    if '}' in text:
+                        end = _json_object_end(response_text)
+                        if end > 0:
+                            break
+                usage = stream.current_message_snapshot.usage
+            return self._decide(response_text[:end] if end > 0 else response_text,
+                                usage, analysis, cache_key)
+        except Exception as e:
+            return self._error_decision(e)
+
+    async def should_enter_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decide several signals concurrently (e.g. a multi-pair scan)
+
+        Args:
+            inputs: List of should_enter() keyword arguments, one per signal
+
+        Returns:
+            Decisions in the same order as inputs. Requests are sent in
+            parallel, so the scan costs about one Claude round-trip instead
+            of one per signal. At most _MAX_CONNECTIONS are in flight: the
+            rest wait here instead of timing out on the connection pool
+            (which should_enter_async would turn into silent rejects).
+        """
+        limit = asyncio.Semaphore(_MAX_CONNECTIONS)
+
+        async def bounded(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            async with limit:
+                return await self.should_enter_async(**kwargs)
+
+        return await asyncio.gather(*[bounded(kwargs) for kwargs in inputs])
+
+    def should_enter_offline_batch(self, inputs: List[Dict[str, Any]],
+                                   poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """
+        Decide a large set of signals through the Message Batches API (back-testing / replay)
+
+        Much cheaper than one request per signal, but results arrive
+        asynchronously (minutes to hours). Rules fast-path and cached
+        decisions are resolved locally; only the rest is submitted.
+        The batch id is saved to batch_file before polling, so calling
+        again with the same inputs after a crash or restart resumes that
+        batch instead of submitting (and paying for) a new one.
+
+        Args:
+            inputs: List of should_enter() keyword arguments, one per signal
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            Decisions in the same order as inputs
+        """
+        decisions: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+        pending = {}  # custom_id -> (index, analysis, cache_key)
+        requests = []
+
+        for i, kwargs in enumerate(inputs):
+            kwargs = {'open_positions': 0, 'reward_risk_ratio': 1.0, 'additional_context': None, **kwargs}
+            try:
+                fast = self._rules_prefilter(kwargs['rsi'], kwargs['reward_risk_ratio'],
+                                             kwargs['additional_context'])
+                if fast is not None:
+                    decisions[i] = fast
+                    continue
+
+                args = (
+                    kwargs['rsi'], kwargs['price'], kwargs['ema_fast'], kwargs['ema_slow'],
+                    kwargs['market_phase'], kwargs['open_positions'],
+                    kwargs['reward_risk_ratio'], kwargs['additional_context']
+                )
+                cache_key = self._cache_key(*args)
+                cached = self._cached_decision(cache_key)
+                if cached is not None:
+                    decisions[i] = cached
+                    continue
+
+                analysis = self._build_analysis_message(*args)
+            except Exception as e:
+                decisions[i] = self._error_decision(e)
+                continue
+
+            custom_id = f"signal-{i}"
+            pending[custom_id] = (i, analysis, cache_key)
+            requests.append({'custom_id': custom_id, 'params': self._build_request(analysis)})
+
+        if requests:
+            try:
+                digests = {r['custom_id']: self._request_digest(r['params']) for r in requests}
+                batch_id = self._pending_batch_id(digests)
+                if batch_id is not None:
+                    batch = self.client.messages.batches.retrieve(batch_id)
+                else:
+                    batch = self.client.messages.batches.create(requests=requests)
+                    # Persist before polling: a restart picks this batch up again
+                    with open(self.batch_file, 'wb') as f:
+                        f.write(_json_dumps({'batch_id': batch.id, 'requests': digests}))
+
+                while batch.processing_status != "ended":
+                    time.sleep(poll_interval)
+                    batch = self.client.messages.batches.retrieve(batch.id)
+
+                for entry in self.client.messages.batches.results(batch.id):
+                    i, analysis, cache_key = pending[entry.custom_id]
+                    if entry.result.type != "succeeded":
+                        self._log_error(f"Batch request {entry.custom_id} {entry.result.type}")
+                        continue
+                    message = entry.result.message
+                    try:
+                        decisions[i] = self._decide(message.content[0].text, message.usage,
+                                                    analysis, cache_key)
+                    except Exception as e:
+                        decisions[i] = self._error_decision(e)
+                os.remove(self.batch_file)
+            except Exception as e:
+                error = self._error_decision(e)
+                decisions = [d if d is not None else error for d in decisions]
+            finally:
+                self._save_stats()
+
+        # Errored / expired / canceled batch entries: safe (no entry) result
+        for i, decision in enumerate(decisions):
+            if decision is None:
+                decisions[i] = {
+                    'should_enter': False,
+                    'confidence': 0.0,
+                    'reason': 'Batch request failed',
+                    'level': self.level,
+                    'timestamp': datetime.now().isoformat()
                 }
-            }
+        return decisions
 
-            # Update stats
-            self.stats['total_decisions'] += 1
-            if decision['should_enter']:
-                self.stats['approved_entries'] += 1
-            else:
-                self.stats['rejected_entries'] += 1
+    def _rules_prefilter(self, rsi: float, reward_risk_ratio: float,
+                         additional_context: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """
+        Reject obvious cases from the SYSTEM_PROMPT hard rules without Claude
 
-            # Track confidence
-            if 'average_confidence' not in self.stats:
-                self.stats['average_confidence'] = 0.0
+        Rejects: alignment < 40%, volatility > 4% without perfect alignment,
+        and the explicit LEVEL 4/5 reject limits (volatility, alignment, R:R).
+        Never accepts: an entry also depends on direction vs RSI extreme,
+        open positions, risk factors and Daily confirmation, which only
+        Claude weighs. Rules only apply to inputs present in
+        additional_context (alignment_score, volatility_pct); anything
+        else goes to Claude.
 
-            n = self.stats['total_decisions']
-            old_avg = self.stats.get('average_confidence', 0.0)
-            self.stats['average_confidence'] = (
-                (old_avg * (n - 1) + decision['confidence']) / n
-            )
+        Returns:
+            Decision dict with 'source': 'rules', or None if Claude must decide
+        """
+        ctx = additional_context or {}
+        alignment = ctx.get('alignment_score')
+        volatility = ctx.get('volatility_pct')
+        reason = None
+
+        if alignment is not None and alignment < 40:
+            reason = f"Alignment {alignment}% < 40%, timeframes misaligned"
+        elif volatility is not None and volatility > 4.0 and (alignment or 0) < 100:
+            reason = f"Volatility {volatility:.2f}% extreme without perfect alignment"
+        elif self.level == 4 and ((volatility is not None and volatility > 2.0) or
+                                  (alignment is not None and alignment < 85) or
+                                  reward_risk_ratio < 3.0):
+            reason = "Level 4 limits: needs volatility <= 2%, alignment >= 85%, R:R >= 1:3"
+        elif self.level == 5 and ((volatility is not None and volatility > 1.5) or
+                                  (alignment is not None and alignment < 90) or
+                                  reward_risk_ratio < 4.0):
+            reason = "Level 5 limits: needs volatility <= 1.5%, alignment >= 90%, R:R >= 1:4"
+
+        if reason is None:
+            return None
+
+        decision = {
+            'should_enter': False,
+            'confidence': 0.0,
+            'reason': f"[RULES] {reason}",
+            'level': self.level,
+            'timestamp': datetime.now().isoformat(),
+            'source': 'rules'
+        }
+        self.stats['rules_decisions'] = self.stats.get('rules_decisions', 0) + 1
+        self._log_decision(decision, 'RULES')
+        if self.stats['rules_decisions'] % _STATS_SAVE_EVERY == 0:
+            self._save_stats()
+        return decision
 
-            # Log decision
-            self._log_decision(decision, analysis)
+    def rules_prefilter_vectorized(self, rsis: np.ndarray, rrs: np.ndarray,
+                                   alignments: np.ndarray,
+                                   volatilities: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _rules_prefilter() over N signals (back-testing / replay)
 
-            # Cache for 30 seconds
-            self.decision_cache[cache_key] = {
-                'decision': decision,
-                'timestamp': datetime.now()
-            }
+        Same reject-only rules as the scalar version; NaN means the input
+        is missing (rule skipped), like an absent key in additional_context.
+        Decided rows are counted in stats['rules_decisions'] but not logged
+        one by one.
+
+        Returns:
+            (decided, should_enter) boolean arrays; decided rows are rejects
+            (should_enter all False), rows with decided=False must go to Claude
+        """
+        rsis = np.asarray(rsis, dtype=float)
+        rrs = np.asarray(rrs, dtype=float)
+        alignments = np.asarray(alignments, dtype=float)
+        vols = (np.full_like(rsis, np.nan) if volatilities is None
+                else np.asarray(volatilities, dtype=float))
+
+        reject = (alignments < 40) | ((vols > 4.0) & ~(alignments >= 100))
+        if self.level == 4:
+            reject |= (vols > 2.0) | (alignments < 85) | (rrs < 3.0)
+        elif self.level == 5:
+            reject |= (vols > 1.5) | (alignments < 90) | (rrs < 4.0)
+
+        self.stats['rules_decisions'] = (
+            self.stats.get('rules_decisions', 0) + int(np.count_nonzero(reject))
+        )
+        return reject, np.zeros_like(reject)
+
+    def _cached_decision(self, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a cached decision younger than the TTL (memory, then disk), if any"""
+        cached = self.decision_cache.get(cache_key)
+        if cached is not None:
+            decision, cached_at = cached
+            if time.monotonic() - cached_at < self._cache_ttl:
+                self.decision_cache.move_to_end(cache_key)
+                return decision
+            return None  # Expired; the disk copy is at least as old
+
+        # Not in memory (cold start): a disk entry still counts only within the TTL
+        if self.disk is not None:
+            stored = self.disk.get(cache_key)
+            if isinstance(stored, tuple):
+                decision, stored_at = stored
+                age = time.time() - stored_at
+                if 0 <= age < self._cache_ttl:
+                    self._cache_decision(cache_key, decision, age)
+                    return decision
+        return None
+
+    def _cache_decision(self, cache_key: tuple, decision: Dict[str, Any], age: float = 0.0):
+        """Store a decision in the in-memory LRU (oldest entry evicted first)"""
+        self.decision_cache[cache_key] = (decision, time.monotonic() - age)
+        self.decision_cache.move_to_end(cache_key)
+        if len(self.decision_cache) > self._cache_max:
+            self.decision_cache.popitem(last=False)
+
+    def _build_request(self, analysis: str) -> Dict[str, Any]:
+        """Keyword arguments for messages.create/stream (sync and async clients)"""
+        return {
+            'model': "claude-opus-4-1-20250805",
+            'max_tokens': 80,  # 3-field JSON only
+            'stop_sequences': ["\n\n"],
+            'system': _SYSTEM_BLOCK_L[self.level],
+            'messages': [
+                {
+                    "role": "user",
+                    "content": analysis
+                }
+            ]
+        }
 
-            return decision
+    def _decide(self, response_text: str, usage, analysis: str, cache_key: tuple) -> Dict[str, Any]:
+        """
+        Parse Claude's response, update stats, log and cache the decision
 
-        except json.JSONDecodeError as e:
-            self._log_error(f"Failed to parse Claude response: {response_text}")
-            return {
-                'should_enter': False,
-                'confidence': 0.0,
-                'reason': 'Decision error',
-                'level': self.level,
-                'timestamp': datetime.now().isoformat()
+        usage comes from the streamed message snapshot: when the stream is
+        cut at the closing brace, output_tokens is the count seen so far.
+        """
+        # Parse Claude's JSON response (system prompt mandates bare JSON)
+        try:
+            decision_data = _json_loads(response_text)
+        except ValueError:
+            # Rare markdown-wrapped reply: strip the fence once and retry
+            decision_data = _json_loads(_FENCE_RE.sub("", response_text))
+
+        # Enhance decision with metadata
+        decision = {
+            'should_enter': decision_data.get('should_enter', False),
+            'confidence': decision_data.get('confidence', 0.0),
+            'reason': decision_data.get('reason', 'Unknown'),
+            'level': self.level,
+            'timestamp': datetime.now().isoformat(),
+            'source': 'claude',
+            'tokens_used': {
+                'input': usage.input_tokens,
+                'output': usage.output_tokens,
+                'cache_creation': usage.cache_creation_input_tokens,
+                'cache_read': usage.cache_read_input_tokens
             }
-        except Exception as e:
+        }
+
+        # Update stats
+        self.stats['total_decisions'] += 1
+        if decision['should_enter']:
+            self.stats['approved_entries'] += 1
+        else:
+            self.stats['rejected_entries'] += 1
+
+        # Track confidence (average derived from the sum in _save_stats/get_stats)
+        self._conf_sum += decision['confidence']
+        n = self.stats['total_decisions']
+
+        # Log decision, persist stats every _STATS_SAVE_EVERY decisions
+        self._log_decision(decision, analysis)
+        if n % _STATS_SAVE_EVERY == 0:
+            self._save_stats()
+
+        # Cache 30s in memory and on disk (disk only serves cold starts)
+        self._cache_decision(cache_key, decision)
+        if self.disk is not None:
+            self.disk.set(cache_key, (decision, time.time()), expire=self._cache_ttl)
+
+        return decision
+
+    @staticmethod
+    def _request_digest(params: Dict[str, Any]) -> str:
+        """Fingerprint of a batch request (model, level system block, analysis text)"""
+        return hashlib.sha256(_json_dumps(
+            [params['model'], params['system'][-1]['text'], params['messages'][-1]['content']]
+        )).hexdigest()
+
+    def _pending_batch_id(self, digests: Dict[str, str]) -> Optional[str]:
+        """
+        Id of a saved in-flight batch submitted for exactly these requests, if any
+
+        Every custom_id must map to the same request digest; a saved batch
+        for other signals is stale and its file is removed.
+        """
+        try:
+            with open(self.batch_file, 'rb') as f:
+                saved = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if saved.get('requests') != digests:
+            self._log_error(f"Discarding stale batch {saved.get('batch_id')}: requests changed")
+            try:
+                os.remove(self.batch_file)
+            except OSError:
+                pass
+            return None
+        return saved.get('batch_id')
+
+    def _error_decision(self, error: Exception) -> Dict[str, Any]:
+        """Log a failed decision and return a safe (no entry) result"""
+        if isinstance(error, json.JSONDecodeError):
+            self._log_error(f"Failed to parse Claude response: {error.doc}")
+            reason = 'Decision error'
+        else:
             import traceback
-            self._log_error(f"Gatekeeper error: {e}")
+            self._log_error(f"Gatekeeper error: {error}")
             self._log_error(f"Traceback: {traceback.format_exc()}")
-            return {
-                'should_enter': False,
-                'confidence': 0.0,
-                'reason': f'API error: {str(e)}',
-                'level': self.level,
-                'timestamp': datetime.now().isoformat()
-            }
-        finally:
-            self._save_stats()
+            reason = f'API error: {str(error)}'
+        return {
+            'should_enter': False,
+            'confidence': 0.0,
+            'reason': reason,
+            'level': self.level,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _cache_key(self, rsi: float, price: float, ema_fast: Optional[float],
+                   ema_slow: Optional[float], market_phase: str, open_positions: int,
+                   reward_risk_ratio: float, additional_context: Optional[Dict]) -> tuple:
+        """
+        Quantized decision cache key
+
+        RSI is bucketed to 0.5, price/EMAs to 0.1%, R:R to 0.1 and alignment
+        to 5%, so snapshots a few seconds apart hit the same cached decision
+        instead of paying another Claude round-trip.
+        """
+        ctx = additional_context or {}
+        direction = ctx.get('primary_direction')
+        return (
+            self.level,
+            round(rsi * 2) / 2,
+            _price_bucket(price),
+            None if ema_fast is None else _price_bucket(ema_fast),
+            None if ema_slow is None else _price_bucket(ema_slow),
+            market_phase,
+            open_positions,
+            round(reward_risk_ratio, 1),
+            round(ctx.get('alignment_score', 0) / 5) * 5,
+            round(ctx.get('opportunity_score', 0) / 5) * 5,
+            _DIRECTIONS.get(direction, direction),
+            ctx.get('volatility_context'),
+            tuple(ctx.get('risk_factors') or ()),
+            # Level label only ("HIGH volatility (2.31% ...)" -> "HIGH")
+            str(ctx.get('volatility', '')).split(' ', 1)[0],
+            str(ctx.get('momentum', '')).split(' ', 1)[0]
+        )
 
-    def _build_analysis_message(self, rsi: float, price: float, ema_fast: float,
-                               ema_slow: float, market_phase: str, open_positions: int,
+    def _build_analysis_message(self, rsi: float, price: float, ema_fast: Optional[float],
+                               ema_slow: Optional[float], market_phase: str, open_positions: int,
                                reward_risk_ratio: float, additional_context: Dict) -> str:
-        """Build compact analysis message (token-optimized)"""
+        """Build compact analysis message (token-optimized, EMA line omitted when unknown)"""
+        ema = ("" if ema_fast is None or ema_slow is None
+               else f"\nEMA: {ema_fast:.0f} vs {ema_slow:.0f}")
 
-        msg = f"""ANALYSIS:
+        msg = f"""Respond starting with {{ and ending with }}
+ANALYSIS:
 Level: {self.level}
 RSI: {rsi:.1f}
-Price: ${price:.2f}
-EMA: {ema_fast:.0f} vs {ema_slow:.0f}
+Price: ${price:.2f}{ema}
 Phase: {market_phase}
 Open: {open_positions}
 R:R: 1:{reward_risk_ratio:.1f}"""
@@ -430,18 +903,25 @@ R:R: 1:{reward_risk_ratio:.1f}"""
 
         return msg
 
+    def _log_timestamp(self) -> str:
+        """'%Y-%m-%d %H:%M:%S' for the current second (memoized per second)"""
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            self._last_ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+        return self._last_ts_str
+
     def _log_decision(self, decision: Dict, analysis: str):
         """Log decision to file"""
         try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            timestamp = self._log_timestamp()
             entry = "APPROVED" if decision['should_enter'] else "REJECTED"
             confidence = decision['confidence']
             reason = decision['reason']
 
             log_line = f"[{timestamp}] {entry} | Conf: {confidence:.2f} | {reason}\n"
 
-            with open(self.log_file, 'a') as f:
-                f.write(log_line)
+            self._log_fh.write(log_line)
         except (IOError, OSError):
             # Failed to write log, skip silently
             pass
@@ -449,9 +929,8 @@ R:R: 1:{reward_risk_ratio:.1f}"""
     def _log_error(self, error: str):
         """Log error to file"""
         try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(self.log_file, 'a') as f:
-                f.write(f"[{timestamp}] ERROR: {error}\n")
+            timestamp = self._log_timestamp()
+            self._log_fh.write(f"[{timestamp}] ERROR: {error}\n")
         except (IOError, OSError):
             # Failed to write error log, skip silently
             pass
@@ -459,14 +938,14 @@ R:R: 1:{reward_risk_ratio:.1f}"""
     def set_level(self, level: int):
         """Dynamically change gatekeeper level (1-5)"""
         self.level = max(1, min(5, level))
+        self.decision_cache.clear()  # Decisions were made under the old level's rules
         self._log_decision(
             {'should_enter': False, 'confidence': 0.0, 'reason': f'Level changed to {self.level}'},
             'LEVEL_CHANGE'
         )
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get decision statistics"""
-        self._load_stats()
+        """Get decision statistics (in-memory, file is only written periodically)"""
         return {
             'level': self.level,
             'total_decisions': self.stats.get('total_decisions', 0),
@@ -476,7 +955,8 @@ R:R: 1:{reward_risk_ratio:.1f}"""
                 self.stats.get('approved_entries', 0) /
                 max(1, self.stats.get('total_decisions', 1))
             ),
-            'average_confidence': self.stats.get('average_confidence', 0.0),
+            'average_confidence': self._conf_sum / max(1, self.stats.get('total_decisions', 0)),
+            'rules_decisions': self.stats.get('rules_decisions', 0),
             'cache_file': self.stats_file
         }
 
@@ -488,4 +968,5 @@ R:R: 1:{reward_risk_ratio:.1f}"""
             'rejected_entries': 0,
             'average_confidence': 0.0
         }
+        self._conf_sum = 0.0
         self._save_stats()
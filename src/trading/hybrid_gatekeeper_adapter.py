@@ -9,15 +9,36 @@ Flow:
 3. GatekeeperV2 makes final decision based on configured level
 """
 
+import asyncio
+import atexit
 import json
-from typing import Dict, Any, Tuple, Optional
+import sys
+from typing import Dict, Any, List, Tuple, Optional
+import numpy as np
 from src.strategy.hybrid import HybridSignal
 from src.trading.gatekeeper_v2 import GatekeeperV2
 
+# Known market phases, interned: cache keys / comparisons downstream hit pointer equality
+_PHASES = {s: sys.intern(s) for s in ("IMPULSE", "CORRECTIVE", "REVERSAL", "NEUTRAL")}
+
 
 class HybridGatekeeperAdapter:
     """Integrates HybridStrategy with GatekeeperV2 for intelligent entry decisions"""
 
+    # Minimum Claude confidence per gatekeeper level (index = level, 0 unused)
+    _MIN_CONF: tuple = (
+        0.5,
+        0.3,   # Level 1: Very permissive, low threshold
+        0.4,   # Level 2: Permissive
+        0.5,   # Level 3: Balanced
+        0.6,   # Level 4: Selective
+        0.75   # Level 5: Maximum selective
+    )
+
+    # Undecided rows above this go through the Message Batches API
+    # (cheaper, no connection-pool pressure) instead of live async requests
+    _OFFLINE_BATCH_MIN = 1000
+
     def __init__(self, gatekeeper_level: int = 2, mode: str = "testnet"):
         """
         Args:
@@ -27,6 +48,8 @@ class HybridGatekeeperAdapter:
         self.gatekeeper = GatekeeperV2(level=gatekeeper_level, mode=mode)
         self.mode = mode
         self.log_file = f"logs/hybrid_gatekeeper_{mode}.log"
+        self._log_fh = open(self.log_file, 'a', buffering=8192)  # logs/ created by GatekeeperV2
+        atexit.register(self._log_fh.close)
         self.last_signal: Optional[HybridSignal] = None
 
     def should_enter(self, signal: HybridSignal, market_phase: str = "NEUTRAL",
@@ -48,35 +71,164 @@ class HybridGatekeeperAdapter:
 
         # Quick reject if technical signal already says no
         if not signal.should_trade:
-            return False, {
-                'approved': False,
-                'reason': 'Technical signal rejected',
-                'gatekeeper_decision': None
-            }
-
-        # If technical signal is weak, check gatekeeper confidence threshold
-        min_confidence_threshold = {
-            1: 0.3,  # Level 1: Very permissive, low threshold
-            2: 0.4,  # Level 2: Permissive
-            3: 0.5,  # Level 3: Balanced
-            4: 0.6,  # Level 4: Selective
-            5: 0.75  # Level 5: Maximum selective
-        }
+            return self._technical_reject()
 
         # Pass to Claude for intelligent validation
         decision = self.gatekeeper.should_enter(
-            rsi=signal.rsi_value,
-            price=signal.entry_price,
-            ema_fast=signal.ema_9,
-            ema_slow=signal.ema_21,
-            market_phase=market_phase,
-            open_positions=open_positions,  # FIXED: Now passed from RiskManager state
-            reward_risk_ratio=self._calculate_rr_ratio(signal),
-            additional_context=additional_context or {}
+            **self._gatekeeper_inputs(signal, market_phase, additional_context, open_positions)
+        )
+        return self._apply_decision(signal, decision)
+
+    async def should_enter_batch(self, requests: List[Dict[str, Any]]) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Validate several HybridStrategy signals concurrently (multi-pair scan)
+
+        Args:
+            requests: List of should_enter() keyword arguments
+                      (signal, market_phase, additional_context, open_positions)
+
+        Returns:
+            [(should_enter, decision_details), ...] in the same order as requests.
+            Signals the technical layer rejected never reach Claude.
+        """
+        results: List[Optional[Tuple[bool, Dict[str, Any]]]] = [None] * len(requests)
+        pending = []
+        for i, request in enumerate(requests):
+            signal = request['signal']
+            self.last_signal = signal
+            if not signal.should_trade:
+                results[i] = self._technical_reject()
+            else:
+                pending.append(i)
+
+        decisions = await self.gatekeeper.should_enter_batch([
+            self._gatekeeper_inputs(
+                requests[i]['signal'],
+                requests[i].get('market_phase', "NEUTRAL"),
+                requests[i].get('additional_context'),
+                requests[i].get('open_positions', 0)
+            )
+            for i in pending
+        ])
+        for i, decision in zip(pending, decisions):
+            results[i] = self._apply_decision(requests[i]['signal'], decision)
+        return results
+
+    async def should_enter_vectorized(self, entries: np.ndarray, stops: np.ndarray,
+                                      tp2s: np.ndarray, sides: np.ndarray, rsis: np.ndarray,
+                                      alignments: np.ndarray,
+                                      volatilities: Optional[np.ndarray] = None,
+                                      ema_fasts: Optional[np.ndarray] = None,
+                                      ema_slows: Optional[np.ndarray] = None,
+                                      market_phase: str = "NEUTRAL") -> np.ndarray:
+        """
+        Validate N technical signals at once (back-testing over many candles)
+
+        R:R and the GatekeeperV2 rules fast-path run as NumPy array ops;
+        only the rows the rules leave undecided are sent to Claude, then
+        filtered by the level confidence threshold. Up to _OFFLINE_BATCH_MIN
+        rows use the (bounded) async batch path; larger sets go through
+        the Message Batches API, which can take minutes to hours.
+
+        Args:
+            entries, stops, tp2s: Entry / stop loss / take profit 2 prices
+            sides: "LONG" / "SHORT" per signal
+            rsis: RSI(7) per signal
+            alignments: Multi-timeframe alignment score (0-100, NaN if unknown)
+            volatilities: Current candle range % (NaN / None if unknown)
+            ema_fasts, ema_slows: EMA values for Claude (omitted from the
+                analysis when not supplied)
+            market_phase: Phase sent to Claude for the undecided rows
+
+        Returns:
+            Boolean array, True where the entry is approved
+        """
+        entries = np.asarray(entries, dtype=float)
+        stops = np.asarray(stops, dtype=float)
+        tp2s = np.asarray(tp2s, dtype=float)
+        rsis = np.asarray(rsis, dtype=float)
+        alignments = np.asarray(alignments, dtype=float)
+
+        # Same R:R as _calculate_rr_ratio (1.0 when risk <= 0)
+        is_long = np.asarray(sides) == "LONG"
+        risk = np.where(is_long, entries - stops, stops - entries)
+        reward = np.where(is_long, tp2s - entries, entries - tp2s)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rr = np.where(risk > 0, reward / risk, 1.0)
+
+        decided, approved = self.gatekeeper.rules_prefilter_vectorized(
+            rsis, rr, alignments, volatilities
         )
 
-        # Get threshold for current level
-        min_conf = min_confidence_threshold.get(self.gatekeeper.level, 0.5)
+        residual = np.flatnonzero(~decided)
+        if residual.size:
+            vols = None if volatilities is None else np.asarray(volatilities, dtype=float)
+            has_emas = ema_fasts is not None and ema_slows is not None
+            if has_emas:
+                ema_fasts = np.asarray(ema_fasts, dtype=float)
+                ema_slows = np.asarray(ema_slows, dtype=float)
+
+            inputs = []
+            for i in residual:
+                context = {}
+                if not np.isnan(alignments[i]):
+                    context['alignment_score'] = float(alignments[i])
+                if vols is not None and not np.isnan(vols[i]):
+                    context['volatility_pct'] = float(vols[i])
+                inputs.append({
+                    'rsi': float(rsis[i]),
+                    'price': float(entries[i]),
+                    'ema_fast': float(ema_fasts[i]) if has_emas else None,
+                    'ema_slow': float(ema_slows[i]) if has_emas else None,
+                    'market_phase': market_phase,
+                    'reward_risk_ratio': float(rr[i]),
+                    'additional_context': context
+                })
+
+            if len(inputs) > self._OFFLINE_BATCH_MIN:
+                # Blocking submit + poll: keep it off the event loop
+                decisions = await asyncio.to_thread(
+                    self.gatekeeper.should_enter_offline_batch, inputs
+                )
+            else:
+                decisions = await self.gatekeeper.should_enter_batch(inputs)
+            min_conf = self._MIN_CONF[self.gatekeeper.level]
+            approved[residual] = [
+                d['should_enter'] and d['confidence'] >= min_conf for d in decisions
+            ]
+
+        return approved
+
+    def _technical_reject(self) -> Tuple[bool, Dict[str, Any]]:
+        """Result for a signal the technical layer already rejected"""
+        return False, {
+            'approved': False,
+            'reason': 'Technical signal rejected',
+            'gatekeeper_decision': None
+        }
+
+    def _gatekeeper_inputs(self, signal: HybridSignal, market_phase: str,
+                           additional_context: Optional[Dict[str, Any]],
+                           open_positions: int) -> Dict[str, Any]:
+        """GatekeeperV2.should_enter() keyword arguments for a signal"""
+        market_phase = _PHASES.get(market_phase) or sys.intern(market_phase)
+        return {
+            'rsi': signal.rsi_value,
+            'price': signal.entry_price,
+            'ema_fast': signal.ema_9,
+            'ema_slow': signal.ema_21,
+            'market_phase': market_phase,
+            'open_positions': open_positions,  # FIXED: Now passed from RiskManager state
+            'reward_risk_ratio': self._calculate_rr_ratio(signal),
+            'additional_context': additional_context or {}
+        }
+
+    def _apply_decision(self, signal: HybridSignal,
+                        decision: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Apply the level confidence threshold to Claude's decision and log it"""
+        # If technical signal is weak, check gatekeeper confidence threshold
+        # (level is clamped 1-5 by GatekeeperV2)
+        min_conf = self._MIN_CONF[self.gatekeeper.level]
 
         # Approval logic
         approved = (
@@ -141,14 +293,14 @@ class HybridGatekeeperAdapter:
             log_entry += f"Claude: {details['claude_decision']} ({details['claude_confidence']:.2f}) | "
             log_entry += f"{details['claude_reason']}\n"
 
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry)
+            self._log_fh.write(log_entry)
         except:
             pass
 
     def clear_logs(self):
         """Clear decision logs"""
         try:
-            open(self.log_file, 'w').close()
+            self._log_fh.flush()
+            self._log_fh.truncate(0)
         except:
             pass
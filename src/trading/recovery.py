@@ -11,31 +11,57 @@ FEATURES:
 - Emergency closure: Safely closes positions if recovery fails
 """
 
+import atexit
 import json
 import os
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional, Dict, List, Any
 import time
 
+try:
+    import orjson
+    _json_loads = orjson.loads
 
+    # numpy scalars (exchange/indicator prices) and non-str keys are accepted like stdlib json
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=(_ORJSON_OPTS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTS)
+except ImportError:
+    # Fallback: stdlib json, compact unless indent requested
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# State file schema: 1 = positions as a list, 2 = positions keyed by order_id
+STATE_SCHEMA_VERSION = 2
+
+
+@dataclass(slots=True)
 class PositionState:
     """Represents a single position for persistence"""
-
-    def __init__(self, order_id: str, symbol: str, side: str, entry_price: float,
-                 quantity: float, stop_loss: float, take_profit_1: float,
-                 take_profit_2: float, entry_time: str = None):
-        self.order_id = order_id
-        self.symbol = symbol
-        self.side = side
-        self.entry_price = entry_price
-        self.quantity = quantity
-        self.stop_loss = stop_loss
-        self.take_profit_1 = take_profit_1
-        self.take_profit_2 = take_profit_2
-        self.entry_time = entry_time or datetime.now().isoformat()
-        self.tp1_closed = False
-        self.tp2_closed = False
-        self.trailing_stop_active = False
+    order_id: str
+    symbol: str
+    side: str
+    entry_price: float
+    quantity: float
+    stop_loss: float
+    take_profit_1: float
+    take_profit_2: float
+    entry_time: Optional[str] = None
+    tp1_closed: bool = False
+    tp2_closed: bool = False
+    trailing_stop_active: bool = False
+
+    def __post_init__(self):
+        if self.entry_time is None:
+            self.entry_time = datetime.now().isoformat()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -53,31 +79,41 @@ class PositionState:
             'trailing_stop_active': self.trailing_stop_active
         }
 
-    @staticmethod
-    def from_dict(data: Dict) -> 'PositionState':
-        pos = PositionState(
-            data['order_id'], data['symbol'], data['side'],
-            data['entry_price'], data['quantity'],
-            data['stop_loss'], data['take_profit_1'],
-            data['take_profit_2'], data.get('entry_time')
-        )
-        pos.tp1_closed = data.get('tp1_closed', False)
-        pos.tp2_closed = data.get('tp2_closed', False)
-        pos.trailing_stop_active = data.get('trailing_stop_active', False)
-        return pos
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PositionState':
+        # Missing optional fields (entry_time, tp flags) keep their defaults
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
 
 
 class StateRecovery:
     """Manages bot state persistence and recovery after crashes"""
 
-    def __init__(self, mode: str = 'testnet'):
+    def __init__(self, mode: str = 'testnet', debug: bool = False):
         self.mode = mode
+        self.debug = debug  # True: human-readable (indented) state file
         self.state_file = f'.bot_state_{mode}.json'
         self.recovery_log_file = f'logs/recovery_{mode}.log'
         self.max_recovery_attempts = 3
         self.recovery_timeout_seconds = 300  # 5 minutes
         self._ensure_logs_dir()
 
+        # In-memory state (loaded lazily: snapshot + write-ahead log replay).
+        # Each mutation appends one JSON line to the WAL; the snapshot is
+        # rewritten (compacted) once the WAL passes wal_compact_bytes,
+        # on force_flush() and at shutdown
+        self.wal_file = self.state_file + '.wal'
+        self.wal_compact_bytes = 64 * 1024
+        self._cache: Optional[Dict] = None
+        self._lock = threading.RLock()
+        self._state_file_exists = os.path.exists(self.state_file)  # Kept current by load/write
+        self._wal_fd: Optional[int] = os.open(self.wal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._wal_size = os.fstat(self._wal_fd).st_size
+        self.load_error: Optional[str] = None  # Set when unreadable state files were moved aside
+
+        # Line-buffered log handle kept open for the process lifetime
+        self._log_fh = open(self.recovery_log_file, 'a', buffering=1)
+        atexit.register(self.close)
+
     def _ensure_logs_dir(self):
         """Ensure logs directory exists"""
         os.makedirs('logs', exist_ok=True)
@@ -85,25 +121,19 @@ class StateRecovery:
     def save_position(self, position: PositionState) -> bool:
         """Save an open position to disk"""
         try:
-            current_state = self._load_state_file() or {'positions': [], 'last_update': None}
-
-            # Add or update position
-            existing_pos = next((p for p in current_state['positions']
-                               if p['order_id'] == position.order_id), None)
+            with self._lock:
+                current_state = self._state()
+                now = time.time()
 
-            if existing_pos:
-                # Update existing position
-                idx = current_state['positions'].index(existing_pos)
-                current_state['positions'][idx] = position.to_dict()
-            else:
-                # Add new position
-                current_state['positions'].append(position.to_dict())
+                # Log first: if serializing/writing fails, memory is left untouched
+                pos = position.to_dict()
+                self._wal_append({'op': 'save', 'pos': pos, 'ts': now})
 
-            current_state['last_update'] = datetime.now().isoformat()
-            current_state['mode'] = self.mode
-
-            with open(self.state_file, 'w') as f:
-                json.dump(current_state, f, indent=2)
+                # Add or update position
+                current_state['positions'][position.order_id] = pos
+                self._touch(current_state, now)
+                current_state['mode'] = self.mode
+                self._compact_if_needed()
 
             self._log_recovery(f"Position saved: {position.order_id} ({position.side} {position.quantity} @ ${position.entry_price:.2f})")
             return True
@@ -114,18 +144,16 @@ class StateRecovery:
     def remove_position(self, order_id: str) -> bool:
         """Remove a closed position from disk"""
         try:
-            current_state = self._load_state_file()
-            if not current_state:
-                return True
-
-            current_state['positions'] = [
-                p for p in current_state['positions']
-                if p['order_id'] != order_id
-            ]
-            current_state['last_update'] = datetime.now().isoformat()
+            with self._lock:
+                current_state = self._state()
+                if not current_state['positions']:
+                    return True
 
-            with open(self.state_file, 'w') as f:
-                json.dump(current_state, f, indent=2)
+                now = time.time()
+                self._wal_append({'op': 'remove', 'id': order_id, 'ts': now})
+                current_state['positions'].pop(order_id, None)
+                self._touch(current_state, now)
+                self._compact_if_needed()
 
             self._log_recovery(f"Position removed: {order_id}")
             return True
@@ -134,13 +162,13 @@ class StateRecovery:
             return False
 
     def get_open_positions(self) -> List[PositionState]:
-        """Load all open positions from disk"""
+        """Load all open positions (in-memory state, loaded from disk on first use)"""
         try:
-            current_state = self._load_state_file()
-            if not current_state or not current_state.get('positions'):
+            current_state = self._state()
+            if not current_state.get('positions'):
                 return []
 
-            positions = [PositionState.from_dict(p) for p in current_state['positions']]
+            positions = [PositionState.from_dict(p) for p in current_state['positions'].values()]
             return positions
         except Exception as e:
             self._log_recovery(f"ERROR loading positions: {e}")
@@ -148,21 +176,22 @@ class StateRecovery:
 
     def detect_crash_with_open_positions(self) -> bool:
         """Detect if bot crashed with open positions"""
-        positions = self.get_open_positions()
-        if not positions:
+        # One state read; no PositionState objects needed for a count + timeout test
+        state_data = self._state()
+        if not state_data.get('positions') or not state_data.get('last_update'):
             return False
 
         # Check if state file is fresh (bot was running recently)
-        state_data = self._load_state_file()
-        if not state_data or not state_data.get('last_update'):
-            return False
 
-        last_update = datetime.fromisoformat(state_data['last_update'])
-        time_since_update = datetime.now() - last_update
+        # Epoch seconds; files written before last_update_epoch existed fall back to the ISO string
+        last_update_epoch = state_data.get('last_update_epoch')
+        if last_update_epoch is None:
+            last_update_epoch = datetime.fromisoformat(state_data['last_update']).timestamp()
+        seconds_since_update = time.time() - last_update_epoch
 
         # If last update was more than 5 minutes ago AND there are open positions = crash detected
-        if time_since_update > timedelta(seconds=self.recovery_timeout_seconds):
-            self._log_recovery(f"CRASH DETECTED! Open positions found after {time_since_update.total_seconds():.0f}s inactivity")
+        if seconds_since_update > self.recovery_timeout_seconds:
+            self._log_recovery(f"CRASH DETECTED! Open positions found after {seconds_since_update:.0f}s inactivity")
             return True
 
         return False
@@ -171,27 +200,26 @@ class StateRecovery:
                             tp2_closed: bool = None, trailing_stop_active: bool = None) -> bool:
         """Update partial close states for a position"""
         try:
-            current_state = self._load_state_file()
-            if not current_state:
-                return False
-
-            for position in current_state['positions']:
-                if position['order_id'] == order_id:
-                    if tp1_closed is not None:
-                        position['tp1_closed'] = tp1_closed
-                    if tp2_closed is not None:
-                        position['tp2_closed'] = tp2_closed
-                    if trailing_stop_active is not None:
-                        position['trailing_stop_active'] = trailing_stop_active
-
-                    current_state['last_update'] = datetime.now().isoformat()
+            with self._lock:
+                current_state = self._state()
 
-                    with open(self.state_file, 'w') as f:
-                        json.dump(current_state, f, indent=2)
-
-                    return True
+                position = current_state['positions'].get(order_id)
+                if position is None:
+                    return False
 
-            return False
+                fields = {}
+                if tp1_closed is not None:
+                    fields['tp1_closed'] = tp1_closed
+                if tp2_closed is not None:
+                    fields['tp2_closed'] = tp2_closed
+                if trailing_stop_active is not None:
+                    fields['trailing_stop_active'] = trailing_stop_active
+                now = time.time()
+                self._wal_append({'op': 'update', 'id': order_id, 'fields': fields, 'ts': now})
+                position.update(fields)
+                self._touch(current_state, now)
+                self._compact_if_needed()
+                return True
         except Exception as e:
             self._log_recovery(f"ERROR updating position state: {e}")
             return False
@@ -211,22 +239,24 @@ class StateRecovery:
             positions = self.get_open_positions()
             api_positions = self._fetch_api_positions(exchange)
 
-            recovered = []
-            lost = []
-            extra = []
+            # Index both sides by order id: O(N+M) set math instead of nested scans
+            persisted = {p.order_id: p for p in positions}
+            api_by_id = {p['id']: p for p in api_positions}
 
-            # Check each persisted position
-            for pos in positions:
-                api_pos = next((p for p in api_positions if p['id'] == pos.order_id), None)
-                if api_pos:
-                    recovered.append(f"{pos.side} {pos.quantity} @ ${pos.entry_price:.2f}")
-                else:
-                    lost.append(f"{pos.order_id}: {pos.side} {pos.quantity}")
+            recovered = [
+                f"{p.side} {p.quantity} @ ${p.entry_price:.2f}"
+                for order_id, p in persisted.items() if order_id in api_by_id
+            ]
+            lost = [
+                f"{order_id}: {p.side} {p.quantity}"
+                for order_id, p in persisted.items() if order_id not in api_by_id
+            ]
 
-            # Check for positions in API but not persisted
-            for api_pos in api_positions:
-                if not any(p.order_id == api_pos['id'] for p in positions):
-                    extra.append(f"{api_pos['id']}: {api_pos.get('info', {})}")
+            # Positions in API but not persisted
+            extra = [
+                f"{api_id}: {api_pos.get('info', {})}"
+                for api_id, api_pos in api_by_id.items() if api_id not in persisted
+            ]
 
             msg = f"API Reconciliation: {len(recovered)} recovered, {len(lost)} lost, {len(extra)} extra"
             self._log_recovery(msg)
@@ -248,59 +278,217 @@ class StateRecovery:
         except:
             return []
 
+    @staticmethod
+    def _touch(state: Dict, now: Optional[float] = None):
+        """Stamp last update: epoch for crash detection, ISO string for humans"""
+        if now is None:
+            now = time.time()
+        state['last_update_epoch'] = now
+        state['last_update'] = datetime.fromtimestamp(now).isoformat()
+
+    def _state(self) -> Dict:
+        """In-memory state, loaded from disk on first access"""
+        with self._lock:
+            if self._cache is None:
+                self._cache = self._load_state_file() or {
+                    'schema_version': STATE_SCHEMA_VERSION,
+                    'positions': {},
+                    'last_update': None
+                }
+                if self._wal_size:
+                    # Fold the previous run's WAL into the snapshot (also drops a torn tail)
+                    self.force_flush()
+            return self._cache
+
+    def _wal_append(self, record: Dict):
+        """Append one mutation to the WAL (before it is applied in memory)"""
+        line = _json_dumps(record) + b'\n'
+        os.write(self._wal_fd, line)
+        self._wal_size += len(line)
+
+    def _compact_if_needed(self):
+        """Compact once the WAL outgrows the threshold (failures are logged, the WAL is kept)"""
+        if self._wal_size >= self.wal_compact_bytes:
+            self.force_flush()
+
+    def _compact(self):
+        """Write the full state as a new snapshot, then truncate the WAL"""
+        with self._lock:
+            self._atomic_write(self._state())
+            os.ftruncate(self._wal_fd, 0)
+            self._wal_size = 0
+
+    def force_flush(self) -> bool:
+        """Compact pending WAL entries into the snapshot now (crash-critical events, shutdown)"""
+        with self._lock:
+            if not self._wal_size:
+                return True
+            try:
+                self._compact()
+                return True
+            except Exception as e:
+                self._log_recovery(f"ERROR writing state file: {e}")
+                return False
+
+    def _atomic_write(self, data: Dict):
+        """
+        Write state via temp file + fsync + os.replace
+
+        A crash mid-write leaves the previous complete file in place instead
+        of a truncated/empty one (rename is atomic on POSIX).
+        """
+        tmp = self.state_file + '.tmp'
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, _json_dumps(data, indent=self.debug))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, self.state_file)
+        self._state_file_exists = True
+
     def _load_state_file(self) -> Optional[Dict]:
         """Load state from disk"""
         try:
-            if not os.path.exists(self.state_file):
+            state = None
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'rb') as f:
+                    state = _json_loads(f.read())
+
+                # Migrate schema 1 (list of positions) to positions keyed by order_id
+                if isinstance(state.get('positions'), list):
+                    state['positions'] = {p['order_id']: p for p in state['positions']}
+
+            if self._wal_size:
+                state = self._replay_wal(state if state is not None else {})
+            if state is None:
                 return None
 
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            state.setdefault('positions', {})
+            state['schema_version'] = STATE_SCHEMA_VERSION
+            return state
         except Exception as e:
-            self._log_recovery(f"ERROR loading state file: {e}")
+            self._quarantine_state_files(e)
             return None
 
+    def _quarantine_state_files(self, error: Exception):
+        """
+        Move an unreadable snapshot and WAL aside instead of compacting over them
+
+        The files are kept as *.corrupt-<epoch ns> for manual recovery; the
+        bot continues from an empty state with a fresh WAL.
+        """
+        suffix = f".corrupt-{time.time_ns()}"  # Unique: never overwrite an earlier quarantine
+        for path in (self.state_file, self.wal_file):
+            if os.path.exists(path):
+                os.replace(path, path + suffix)
+
+        # The open WAL handle followed the rename: start a new log
+        os.close(self._wal_fd)
+        self._wal_fd = os.open(self.wal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._wal_size = 0
+        self._state_file_exists = False
+
+        self.load_error = f"{error} (state files moved to *{suffix})"
+        self._log_recovery(f"ERROR loading state file: {self.load_error}")
+        print(f"❌ Recovery state unreadable, open positions unknown: {self.load_error}")
+
+    def _replay_wal(self, state: Dict) -> Dict:
+        """Apply the WAL records written after the snapshot, in order"""
+        positions = state.setdefault('positions', {})
+        with open(self.wal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    break  # Partial line from a crash mid-append
+
+                op = record['op']
+                if op == 'save':
+                    positions[record['pos']['order_id']] = record['pos']
+                    state['mode'] = self.mode
+                elif op == 'remove':
+                    positions.pop(record['id'], None)
+                elif op == 'update' and record['id'] in positions:
+                    positions[record['id']].update(record['fields'])
+
+                state['last_update_epoch'] = record['ts']
+                state['last_update'] = datetime.fromtimestamp(record['ts']).isoformat()
+        return state
+
     def _log_recovery(self, message: str):
         """Log recovery events"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_entry = f"[{timestamp}] {message}\n"
 
         try:
-            with open(self.recovery_log_file, 'a') as f:
-                f.write(log_entry)
+            self._log_fh.write(log_entry)
+        except:
+            pass
+
+    def close(self):
+        """Compact pending state and close the WAL and recovery log (shutdown)"""
+        self.force_flush()
+        with self._lock:
+            if self._wal_fd is not None:
+                os.close(self._wal_fd)
+                self._wal_fd = None
+        try:
+            self._log_fh.close()
         except:
             pass
 
     def clear_state(self):
         """Clear all persisted state (call after successful recovery or bot shutdown)"""
         try:
-            if os.path.exists(self.state_file):
-                os.remove(self.state_file)
+            with self._lock:
+                # Replace with an empty state (one atomic write, no exists/remove race)
+                # and drop the WAL so replay cannot resurrect cleared positions
+                self._cache = {
+                    'schema_version': STATE_SCHEMA_VERSION,
+                    'positions': {},
+                    'mode': self.mode
+                }
+                self._touch(self._cache)
+                self._compact()
             self._log_recovery("State cleared")
             return True
         except Exception as e:
             self._log_recovery(f"ERROR clearing state: {e}")
             return False
 
-    def get_recovery_stats(self) -> Dict[str, Any]:
-        """Get recovery system statistics"""
-        positions = self.get_open_positions()
+    def get_recovery_stats_fast(self) -> Dict[str, Any]:
+        """Recovery summary from in-memory state only (cheap, for frequent polling)"""
+        try:
+            log_size = self._log_fh.tell()  # Append handle: position = file size
+        except (OSError, ValueError):
+            log_size = 0
         return {
-            'open_positions_count': len(positions),
-            'state_file_exists': os.path.exists(self.state_file),
-            'recovery_log_size': os.path.getsize(self.recovery_log_file) if os.path.exists(self.recovery_log_file) else 0,
-            'positions': [
-                {
-                    'order_id': p.order_id,
-                    'side': p.side,
-                    'quantity': p.quantity,
-                    'entry_price': p.entry_price,
-                    'entry_time': p.entry_time
-                }
-                for p in positions
-            ]
+            'open_positions_count': len(self._state()['positions']),
+            'state_file_exists': self._state_file_exists,
+            'recovery_log_size': log_size,
+            'load_error': self.load_error
         }
 
+    def get_recovery_stats_full(self) -> Dict[str, Any]:
+        """Recovery summary plus per-position details (debug UI)"""
+        stats = self.get_recovery_stats_fast()
+        stats['positions'] = [
+            {
+                'order_id': p.order_id,
+                'side': p.side,
+                'quantity': p.quantity,
+                'entry_price': p.entry_price,
+                'entry_time': p.entry_time
+            }
+            for p in self.get_open_positions()
+        ]
+        return stats
+
+    def get_recovery_stats(self) -> Dict[str, Any]:
+        """Get recovery system statistics (same as get_recovery_stats_full)"""
+        return self.get_recovery_stats_full()
+
 
 class EmergencyClosureManager:
     """Manages emergency closure of positions when bot fails repeatedly"""
@@ -311,16 +499,17 @@ class EmergencyClosureManager:
         self.recovery = recovery
         self.max_failures = max_failures
         self.failure_count = 0
-        self.failure_timestamps = []
+        self.failure_timestamps: deque = deque(maxlen=1024)  # Epoch seconds, oldest first
 
     def record_failure(self):
         """Record a bot failure"""
-        now = datetime.now()
+        now = time.time()
         self.failure_timestamps.append(now)
 
-        # Remove failures older than 1 hour
-        one_hour_ago = now - timedelta(hours=1)
-        self.failure_timestamps = [ts for ts in self.failure_timestamps if ts > one_hour_ago]
+        # Remove failures older than 1 hour (timestamps are appended in order)
+        one_hour_ago = now - 3600
+        while self.failure_timestamps and self.failure_timestamps[0] <= one_hour_ago:
+            self.failure_timestamps.popleft()
 
         self.failure_count = len(self.failure_timestamps)
 
@@ -328,6 +517,21 @@ class EmergencyClosureManager:
         """Determine if positions should be emergency closed"""
         return self.failure_count >= self.max_failures
 
+    def _close_one(self, position: PositionState) -> Dict[str, Any]:
+        """Close a single position at market and drop it from persisted state"""
+        order_side = 'sell' if position.side == 'LONG' else 'buy'
+
+        # Note: This is simplified. Actual implementation depends on your exchange setup
+        # For testnet/spot, you'd use create_market_sell_order or create_market_buy_order
+        order = self.exchange.create_market_order(
+            self.symbol,
+            order_side,
+            position.quantity
+        )
+
+        self.recovery.remove_position(position.order_id)
+        return order
+
     def close_all_positions(self, reason: str = "Emergency closure due to repeated bot failures") -> bool:
         """Close all open positions at market"""
         try:
@@ -336,27 +540,19 @@ class EmergencyClosureManager:
             if not positions:
                 return True  # No positions to close
 
+            # Sequential on purpose: the sync ccxt exchange (nonce, rate limiter)
+            # is not thread-safe. A failure does not stop the remaining closures.
+            success = True
             for position in positions:
                 try:
-                    # Create market order to close position
-                    order_side = 'sell' if position.side == 'LONG' else 'buy'
-
-                    # Note: This is simplified. Actual implementation depends on your exchange setup
-                    # For testnet/spot, you'd use create_market_sell_order or create_market_buy_order
-                    order = self.exchange.create_market_order(
-                        self.symbol,
-                        order_side,
-                        position.quantity
-                    )
-
-                    self.recovery.remove_position(position.order_id)
+                    order = self._close_one(position)
                     print(f"🚨 Emergency closed {position.side} position: {order.get('id', 'unknown')}")
-
                 except Exception as e:
                     print(f"❌ Failed to close position {position.order_id}: {e}")
-                    return False
+                    success = False
 
-            return True
+            self.recovery.force_flush()
+            return success
 
         except Exception as e:
             print(f"❌ Emergency closure failed: {e}")
@@ -6,8 +6,31 @@ Determina horarios activos, off-hours, y momentos de máxima liquidez
 """
 
 from datetime import datetime, time, timedelta
-from typing import Optional, List
-from dataclasses import dataclass
+from typing import Callable, Optional, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+def _to_minutes(hhmm: str) -> int:
+    """Convierte "HH:MM" a minutos desde medianoche"""
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def _make_minute_check(start_min: int, end_min: int) -> Callable[[int], bool]:
+    """
+    Genera la comprobación de rango [start, end) para minutos del día con los
+    límites fijados en el closure (sin accesos a self en cada llamada)
+    """
+    if start_min > end_min:
+        # Rango que cruza medianoche (ASIAN: 21:00 -> 06:00 next day)
+        def check(cur: int) -> bool:
+            return cur >= start_min or cur < end_min
+    else:
+        def check(cur: int) -> bool:
+            return start_min <= cur < end_min
+    return check
+
 
 @dataclass
 class TradingSession:
@@ -18,27 +41,36 @@ class TradingSession:
     opening_hour_start: str  # "21:00" - cuando abre
     opening_hour_end: str  # "22:00" - fin del pico de liquidez
 
+    # Límites en minutos desde medianoche, calculados una vez (las sesiones son estáticas)
+    start_min: int = field(init=False, repr=False)
+    end_min: int = field(init=False, repr=False)
+    op_start_min: int = field(init=False, repr=False)
+    op_end_min: int = field(init=False, repr=False)
+    crosses_midnight: bool = field(init=False, repr=False)
+    closing_alert_time: str = field(init=False, repr=False)
+    # Comprobaciones especializadas por sesión (límites fijados al construir)
+    _is_active_fast: Callable[[int], bool] = field(init=False, repr=False, compare=False)
+    _is_opening_fast: Callable[[int], bool] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.start_min = _to_minutes(self.start_utc)
+        self.end_min = _to_minutes(self.end_utc)
+        self.op_start_min = _to_minutes(self.opening_hour_start)
+        self.op_end_min = _to_minutes(self.opening_hour_end)
+        self.crosses_midnight = self.start_min > self.end_min
+        self._is_active_fast = _make_minute_check(self.start_min, self.end_min)
+        self._is_opening_fast = _make_minute_check(self.op_start_min, self.op_end_min)
+
+        # Alerta de cierre: 30 minutos antes del fin de sesión
+        alert_minutes = (self.end_min - 30) % (24 * 60)
+        self.closing_alert_time = f"{alert_minutes // 60:02d}:{alert_minutes % 60:02d}"
+
     def is_active(self, current_time: datetime) -> bool:
         """
         Verifica si la sesión está activa en el horario actual (UTC)
         Maneja sesiones que cruzan medianoche (ASIAN: 21:00 día anterior -> 06:00 día actual)
         """
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        current_time_minutes = current_hour * 60 + current_minute
-
-        start_parts = self.start_utc.split(':')
-        start_minutes = int(start_parts[0]) * 60 + int(start_parts[1])
-
-        end_parts = self.end_utc.split(':')
-        end_minutes = int(end_parts[0]) * 60 + int(end_parts[1])
-
-        # Sesión que cruza medianoche (ASIAN: 21:00 -> 06:00 next day)
-        if start_minutes > end_minutes:
-            return current_time_minutes >= start_minutes or current_time_minutes < end_minutes
-
-        # Sesión normal (EUROPEAN: 07:00 -> 16:00)
-        return start_minutes <= current_time_minutes < end_minutes
+        return self._is_active_fast(current_time.hour * 60 + current_time.minute)
 
     def is_opening_hour(self, current_time: datetime) -> bool:
         """
@@ -48,37 +80,14 @@ class TradingSession:
         - EUROPEAN: 08:00-09:00 (London opening)
         - AMERICAN: 13:30-14:30 (NY opening)
         """
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        current_time_minutes = current_hour * 60 + current_minute
-
-        opening_start_parts = self.opening_hour_start.split(':')
-        opening_start_minutes = int(opening_start_parts[0]) * 60 + int(opening_start_parts[1])
-
-        opening_end_parts = self.opening_hour_end.split(':')
-        opening_end_minutes = int(opening_end_parts[0]) * 60 + int(opening_end_parts[1])
-
-        return opening_start_minutes <= current_time_minutes < opening_end_minutes
+        return self._is_opening_fast(current_time.hour * 60 + current_time.minute)
 
     def get_closing_alert_time(self) -> str:
         """
         Retorna la hora en que debe alertar sobre cierre de sesión (30 min antes)
-        Retorna en formato "HH:MM"
+        Retorna en formato "HH:MM" (precalculado en __post_init__)
         """
-        end_parts = self.end_utc.split(':')
-        end_hour = int(end_parts[0])
-        end_minute = int(end_parts[1])
-
-        # Restar 30 minutos
-        total_minutes = end_hour * 60 + end_minute - 30
-
-        if total_minutes < 0:
-            total_minutes += 24 * 60  # Day before
-
-        alert_hour = (total_minutes // 60) % 24
-        alert_minute = total_minutes % 60
-
-        return f"{alert_hour:02d}:{alert_minute:02d}"
+        return self.closing_alert_time
 
     def get_session_name(self) -> str:
         """Retorna nombre amigable de la sesión"""
@@ -110,6 +119,17 @@ TRADING_SESSIONS: List[TradingSession] = [
     )
 ]
 
+# Tablas por minuto del día (0-1439), resueltas una vez al importar:
+# sesión activa (primera que coincide, None = off-hours) y si es hora de apertura
+_SESSION_BY_MINUTE: List[Optional[TradingSession]] = [
+    next((s for s in TRADING_SESSIONS if s.is_active(time(m // 60, m % 60))), None)
+    for m in range(24 * 60)
+]
+_OPENING_BY_MINUTE: List[bool] = [
+    session is not None and session.is_opening_hour(time(m // 60, m % 60))
+    for m, session in enumerate(_SESSION_BY_MINUTE)
+]
+
 
 def get_active_session(current_time: Optional[datetime] = None) -> Optional[TradingSession]:
     """
@@ -121,11 +141,7 @@ def get_active_session(current_time: Optional[datetime] = None) -> Optional[Trad
         from datetime import timezone
         current_time = datetime.now(timezone.utc)
 
-    for session in TRADING_SESSIONS:
-        if session.is_active(current_time):
-            return session
-
-    return None
+    return _SESSION_BY_MINUTE[current_time.hour * 60 + current_time.minute]
 
 
 def get_session_by_name(name: str) -> Optional[TradingSession]:
@@ -144,10 +160,7 @@ def is_in_opening_hour(current_time: Optional[datetime] = None) -> bool:
         from datetime import timezone
         current_time = datetime.now(timezone.utc)
 
-    session = get_active_session(current_time)
-    if session:
-        return session.is_opening_hour(current_time)
-    return False
+    return _OPENING_BY_MINUTE[current_time.hour * 60 + current_time.minute]
 
 
 def is_off_hours(current_time: Optional[datetime] = None) -> bool:
@@ -166,25 +179,34 @@ def get_session_status() -> dict:
     """
     from datetime import timezone
     now = datetime.now(timezone.utc)
-    current_time_str = now.strftime("%H:%M")
+    status = _build_status(now.hour * 60 + now.minute)
+
+    # Copia: el dict cacheado se comparte entre llamadas del mismo minuto
+    return {**status, "sessions": {name: dict(info) for name, info in status["sessions"].items()}}
+
+
+@lru_cache(maxsize=24 * 60)
+def _build_status(minute_of_day: int) -> dict:
+    """Estado de las sesiones para un minuto del día (idéntico durante todo el minuto)"""
+    current = time(minute_of_day // 60, minute_of_day % 60)
 
     status = {
-        "current_time_utc": current_time_str,
+        "current_time_utc": current.strftime("%H:%M"),
         "active_session": None,
         "is_opening_hour": False,
         "sessions": {}
     }
 
-    active = get_active_session(now)
+    active = _SESSION_BY_MINUTE[minute_of_day]
     if active:
         status["active_session"] = active.name
-        status["is_opening_hour"] = active.is_opening_hour(now)
+        status["is_opening_hour"] = _OPENING_BY_MINUTE[minute_of_day]
 
     for session in TRADING_SESSIONS:
         status["sessions"][session.name] = {
             "hours": f"{session.start_utc}-{session.end_utc}",
-            "is_active": session.is_active(now),
-            "is_opening": session.is_opening_hour(now)
+            "is_active": session.is_active(current),
+            "is_opening": session.is_opening_hour(current)
         }
 
     return status